@@ -0,0 +1,188 @@
+"""
+Implementation of AnalyticSpace class and methods.
+File: AnalyticSpace.py
+Author: Aidan Collins
+Github: aijac0
+Email: aidancollinscs@gmail.com
+"""
+
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AnalyticSpace:
+
+    def __init__(self, space):
+        """
+        Instantiate an AnalyticSpace object.
+        Without particle or obstacle collisions, each particle moves independently and reflects off boundaries,
+        so its position at any time is a triangle wave fold of its unbounded path into the space.
+
+        Args:
+            space (Space): Space to simulate, which must be supported by is_supported().
+        """
+
+        # Attributes
+        self.space = space
+        self.b_collision = bool(space.manager.single_cls)
+
+
+    @classmethod
+    def is_supported(cls, space):
+        """
+        Determine if space can be simulated analytically.
+
+        Args:
+            space (Space): Space to simulate.
+
+        Returns:
+            bool: Whether or not particles only collide with space boundaries.
+        """
+
+        # Particles collide with each other unless disabled for every pair of species
+        manager = space.manager
+        interactions = manager.interactions
+        p_collision = manager.multiple_cls and (interactions is None or any(any(row) for row in interactions))
+
+        return not p_collision and manager.index is None
+
+
+    def positions(self, times, workers=None):
+        """
+        Get positions of particles at specified times after the current state of space.
+        Each time is computed independently, so times are split between workers.
+
+        Args:
+            times (ndarray): Times to get positions at.
+            workers (int, optional): Number of threads to compute positions with. Defaults to None.
+
+        Returns:
+            ndarray: X,Y position of each particle at each time.
+        """
+
+        return self.__compute(lambda t: self.__fold(t)[0], times, workers)
+
+
+    def states(self, times, workers=None):
+        """
+        Get positions and velocities of particles at specified times after the current state of space.
+
+        Args:
+            times (ndarray): Times to get states at.
+            workers (int, optional): Number of threads to compute states with. Defaults to None.
+
+        Returns:
+            ndarray: X,Y position and Vx,Vy velocity of each particle at each time.
+        """
+
+        # Current velocity of particles
+        V = np.array([(p.Vx, p.Vy) for p in self.space.particles], dtype=np.float64)
+
+        # Positions, and velocities reflected by boundaries
+        def state(t):
+            P, S = self.__fold(t)
+            return np.concatenate([P, V * S], axis=2)
+
+        return self.__compute(state, times, workers)
+
+
+    def simulate(self, tts):
+        """
+        Simulate particles in space for specified time.
+
+        Args:
+            tts (float): Time to simulate.
+        """
+
+        # Positions and velocity directions of particles after specified time
+        P, S = self.__fold(np.array([tts], dtype=np.float64))
+
+        # Update particles
+        for p, (X, Y), (Sx, Sy) in zip(self.space.particles, P[0].tolist(), S[0].tolist()):
+            p.X, p.Y = X, Y
+            p.Vx, p.Vy = p.Vx * Sx, p.Vy * Sy
+        self.space.time += tts
+
+
+    def __compute(self, f, times, workers):
+        """
+        Apply function to times, splitting times between workers.
+
+        Args:
+            f (function): Function computing a result for each of an array of times.
+            times (ndarray): Times to compute results for.
+            workers (int): Number of threads to compute results with.
+
+        Returns:
+            ndarray: Result for each time.
+        """
+
+        # Compute results in a single pass
+        times = np.asarray(times, dtype=np.float64)
+        if not workers or workers == 1 or len(times) < 2:
+            return f(times)
+
+        # Compute chunks of times in parallel
+        with ThreadPoolExecutor(workers) as executor:
+            return np.concatenate(list(executor.map(f, np.array_split(times, workers))))
+
+
+    def __fold(self, times):
+        """
+        Get positions and velocity directions of particles at specified times.
+
+        Args:
+            times (ndarray): Times to get positions at.
+
+        Returns:
+            tuple: X,Y position of each particle at each time, and sign of Vx,Vy relative to current velocity.
+        """
+
+        # Current state of particles
+        particles = self.space.particles
+        P = np.array([(p.X, p.Y) for p in particles], dtype=np.float64)
+        V = np.array([(p.Vx, p.Vy) for p in particles], dtype=np.float64)
+        r = np.array([p.radius for p in particles], dtype=np.float64)[:, None]
+
+        # Unbounded positions at each time
+        U = P + np.multiply.outer(times, V)
+        if not self.b_collision:
+            return U, np.ones_like(U)
+
+        # Distance each particle can travel between boundaries along X,Y
+        L = np.array([self.space.width, self.space.height], dtype=np.float64) - 2 * r
+
+        # Fold unbounded positions into [r, size - r]; particles move backwards on the descending half
+        u = np.mod(U - r, 2 * L)
+        return r + L - np.abs(u - L), np.where(u < L, 1.0, -1.0)
+
+
+if __name__ == "__main__":
+    from random import seed
+    from time import perf_counter
+
+    from Space import Space
+
+    # Identical spaces without particle collisions
+    seed(0)
+    space = Space(200, width=400, height=400, p_collision=False)
+    seed(0)
+    analytic = AnalyticSpace(Space(200, width=400, height=400, p_collision=False))
+
+    # Simulate frames using events
+    tts = 1 / 60
+    start = perf_counter()
+    frames = []
+    for _ in range(600):
+        space.simulate(tts)
+        frames.append([(p.X, p.Y) for p in space.particles])
+    events = perf_counter() - start
+
+    # Compute frames analytically
+    start = perf_counter()
+    positions = analytic.positions(tts * np.arange(1, 601), workers=4)
+    closed = perf_counter() - start
+
+    print("Event loop: %.3f seconds" % events)
+    print("Analytic: %.3f seconds" % closed)
+    print("Max position difference:", np.abs(positions - np.array(frames)).max())
@@ -0,0 +1,311 @@
+"""
+Implementation of BatchSpace class and methods.
+File: BatchSpace.py
+Author: Aidan Collins
+Github: aijac0
+Email: aidancollinscs@gmail.com
+"""
+
+import numpy as np
+from random import uniform
+from typing import Collection
+
+from Particle import Particle
+from EventManager import EventManager
+
+
+class BatchSpace:
+
+    def __init__(self, n_spaces, n_particles, width=500, height=500, b_collision=True, p_collision=True,
+                 interactions=None, **kwargs):
+        """
+        Create a batch of independent 2D particle spaces.
+        Particles of every space are stored in arrays with a leading batch axis, and simulated together.
+        Each optional parameter is either an int or a tuple.
+        Tuple means that a random value within bounds will be given to each space.
+
+        Args:
+            n_spaces (int): Number of spaces in batch.
+            n_particles (int/tuple): Number of particles in each space.
+            width (int/tuple, optional): Size of X dimension. Defaults to 500.
+            height (int/tuple, optional): Size of Y dimension. Defaults to 500.
+            b_collision (bool, optional): Turn on boundary collision. Defaults to True.
+            p_collision (bool, optional): Turn on particle collision. Defaults to True.
+            interactions (list(list(bool)), optional): Whether each pair of species collide. Defaults to None.
+        """
+
+        # Obstacles are only supported by Space
+        if kwargs.get('obstacles'):
+            raise ValueError("BatchSpace does not support obstacles")
+        
+        # Species interactions must be given for every species generated
+        if interactions is not None:
+            species = kwargs.get('species')
+            EventManager.check_interactions(interactions, len(species) if species else len(kwargs.get('color_r', Particle.colors)))
+
+        # Get random values for each space if specified
+        n = [round(uniform(*n_particles)) if isinstance(n_particles, Collection) else n_particles for _ in range(n_spaces)]
+        self.width = np.array([uniform(*width) if isinstance(width, Collection) else width for _ in range(n_spaces)], dtype=np.float64)
+        self.height = np.array([uniform(*height) if isinstance(height, Collection) else height for _ in range(n_spaces)], dtype=np.float64)
+
+        # Attributes
+        self.n_spaces = n_spaces
+        self.n_particles = np.array(n)
+        self.b_collision = b_collision
+        self.p_collision = p_collision
+        self.interactions = None if interactions is None else np.array(interactions, dtype=bool)
+        self.time = np.zeros(n_spaces)
+        self.b_count = np.zeros(n_spaces, dtype=np.int64)
+        self.p_count = np.zeros(n_spaces, dtype=np.int64)
+
+        # Create particles
+        self.__create_particles(max(n), **kwargs)
+
+
+    def simulate(self, time, fps=None):
+        """
+        Simulate particles in every space for specified time.
+
+        Args:
+            time (float): Time to simulate.
+            fps (int, optional): Number of frames to record per second. Defaults to None, recording only the final frame.
+
+        Returns:
+            ndarray: X,Y position of each particle in each space at the start and end of each frame.
+        """
+
+        # Times at the end of each frame
+        n_frames = int(fps * time) if fps else 1
+        tts = time / n_frames
+        start = self.time.copy()
+
+        # Particle positions for each frame; padded particles are NaN
+        frames = np.full((self.n_spaces, n_frames + 1, self.mask.shape[1], 2), np.nan)
+        frames[:, 0] = self.__positions()
+
+        # Index of the next frame to record in each space
+        frame = np.ones(self.n_spaces, dtype=np.int64)
+        spaces = np.arange(self.n_spaces)
+
+        # Repeatedly simulate events until every space has recorded every frame
+        active = frame <= n_frames
+        while active.any():
+
+            # Time until the next event in each space
+            b_time, b_hit = self.__boundary_times()
+            p_time, p_i, p_j = self.__pair_times()
+
+            # Time until the next event or end of frame; finished spaces do not proceed
+            f_time = start + frame * tts - self.time
+            dt = np.where(active, np.minimum(np.minimum(b_time, p_time), f_time), 0)
+            dt = np.maximum(dt, 0)
+
+            # Proceed simulation until event
+            self.X += self.Vx * dt[:, None]
+            self.Y += self.Vy * dt[:, None]
+            self.time += dt
+
+            # Simulate boundary collisions occuring at time of event
+            if self.b_collision:
+                hit = active[:, None, None] & (b_hit <= dt[:, None, None])
+                self.Vx = np.where(hit[..., 0], -self.Vx, self.Vx)
+                self.Vy = np.where(hit[..., 1], -self.Vy, self.Vy)
+                self.b_count += hit.any(axis=2).sum(axis=1)
+
+            # Simulate soonest particle collision in spaces where it occurs at time of event
+            if self.p_collision:
+                k = spaces[active & (p_time <= dt)]
+                self.__collide(k, p_i[k], p_j[k])
+                self.p_count += np.bincount(k, minlength=self.n_spaces)
+
+            # Record frames that have ended
+            ended = active & (f_time <= dt)
+            k = spaces[ended]
+            self.time[k] = start[k] + frame[k] * tts
+            frames[k, frame[k]] = self.__positions()[k]
+            frame[k] += 1
+            active = frame <= n_frames
+
+        return frames
+
+
+    def summary(self):
+        """
+        Get summary statistics of each space.
+
+        Returns:
+            dict: Time elapsed, kinetic energy, momentum and number of collisions in each space.
+        """
+
+        # Kinetic energy and momentum, excluding padded particles
+        KE = np.where(self.mask, 0.5 * self.mass * (self.Vx ** 2 + self.Vy ** 2), 0).sum(axis=1)
+        Px = np.where(self.mask, self.mass * self.Vx, 0).sum(axis=1)
+        Py = np.where(self.mask, self.mass * self.Vy, 0).sum(axis=1)
+
+        return {'time': self.time.copy(), 'energy': KE, 'momentum': np.stack([Px, Py], axis=1),
+                'boundary_collisions': self.b_count.copy(), 'particle_collisions': self.p_count.copy()}
+
+
+    def __boundary_times(self):
+        """
+        Get time until each particle collides with the boundaries of its space.
+
+        Returns:
+            tuple: Soonest boundary collision in each space, and time until each particle reaches X,Y boundaries.
+        """
+
+        # Minimum and maximum position of particle centers
+        max_X = self.width[:, None] - self.radius
+        max_Y = self.height[:, None] - self.radius
+
+        # Time until particles reach the boundary they are moving towards
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_x = np.where(self.Vx > 0, (max_X - self.X) / self.Vx, np.where(self.Vx < 0, (self.radius - self.X) / self.Vx, np.inf))
+            t_y = np.where(self.Vy > 0, (max_Y - self.Y) / self.Vy, np.where(self.Vy < 0, (self.radius - self.Y) / self.Vy, np.inf))
+        times = np.maximum(np.stack([t_x, t_y], axis=2), 0)
+
+        # Boundary collisions are disabled, or particle is padding
+        times[~self.mask] = np.inf
+        if not self.b_collision:
+            times[:] = np.inf
+
+        return times.min(axis=(1, 2)), times
+
+
+    def __pair_times(self):
+        """
+        Get the soonest collision between any two particles in each space.
+
+        Returns:
+            tuple: Time until soonest collision, and indices of particles colliding, in each space.
+        """
+
+        # No particle collisions
+        K, N = self.mask.shape
+        if not self.p_collision or N < 2:
+            return np.full(K, np.inf), np.zeros(K, dtype=np.int64), np.zeros(K, dtype=np.int64)
+
+        # Relative positions and velocities of each pair of particles
+        dX = self.X[:, :, None] - self.X[:, None, :]
+        dY = self.Y[:, :, None] - self.Y[:, None, :]
+        dVx = self.Vx[:, :, None] - self.Vx[:, None, :]
+        dVy = self.Vy[:, :, None] - self.Vy[:, None, :]
+        d = self.radius[:, :, None] + self.radius[:, None, :]
+
+        # Coefficients of equation to get time that particles collide
+        a = dVx ** 2 + dVy ** 2
+        b = 2 * (dX * dVx + dY * dVy)
+        c = dX ** 2 + dY ** 2 - d ** 2
+        exp = b ** 2 - 4 * a * c
+
+        # Soonest result of quadratic equation for approaching particles
+        with np.errstate(divide='ignore', invalid='ignore'):
+            times = np.maximum((-b - np.sqrt(exp)) / (2 * a), 0)
+        times[~(self.pairs & (b < 0) & (exp >= 0))] = np.inf
+
+        # Soonest collision in each space
+        flat = times.reshape(K, -1).argmin(axis=1)
+        return times.reshape(K, -1)[np.arange(K), flat], flat // N, flat % N
+
+
+    def __collide(self, k, i, j):
+        """
+        Simulate collision between particles i and j in spaces k, using elastic impulses.
+
+        Args:
+            k (ndarray): Indices of spaces.
+            i (ndarray): Index of first particle in each space.
+            j (ndarray): Index of second particle in each space.
+        """
+
+        # Unit normal along the axes of collision
+        Nx, Ny = self.X[k, i] - self.X[k, j], self.Y[k, i] - self.Y[k, j]
+        d = np.hypot(Nx, Ny)
+        Nx, Ny = Nx / d, Ny / d
+
+        # Impulse exchanged along the normal
+        m1, m2 = self.mass[k, i], self.mass[k, j]
+        J = 2 * m1 * m2 / (m1 + m2) * np.minimum((self.Vx[k, i] - self.Vx[k, j]) * Nx + (self.Vy[k, i] - self.Vy[k, j]) * Ny, 0)
+
+        # Velocities after collision
+        self.Vx[k, i] -= J / m1 * Nx
+        self.Vy[k, i] -= J / m1 * Ny
+        self.Vx[k, j] += J / m2 * Nx
+        self.Vy[k, j] += J / m2 * Ny
+
+
+    def __positions(self):
+        """
+        Get positions of particles, with padded particles as NaN.
+
+        Returns:
+            ndarray: X,Y position of each particle in each space.
+        """
+
+        return np.where(self.mask[..., None], np.stack([self.X, self.Y], axis=2), np.nan)
+
+
+    def __create_particles(self, max_particles, **kwargs):
+        """
+        Create particles to fill each space.
+
+        Args:
+            max_particles (int): Number of particles in the largest space.
+        """
+
+        # Arrays to hold particle attributes; padded particles are masked out
+        shape = (self.n_spaces, max_particles)
+        self.X, self.Y = np.zeros(shape), np.zeros(shape)
+        self.Vx, self.Vy = np.zeros(shape), np.zeros(shape)
+        self.radius, self.mass = np.ones(shape), np.ones(shape)
+        self.species = np.zeros(shape, dtype=np.int64)
+        self.mask = np.arange(max_particles)[None, :] < self.n_particles[:, None]
+
+        # Generate particles of each space
+        for k in range(self.n_spaces):
+            p_gen = Particle.particle_generator(int(self.n_particles[k]), self.width[k], self.height[k], **kwargs)
+            for i in range(self.n_particles[k]):
+                p = p_gen.__next__()
+                self.X[k, i], self.Y[k, i], self.Vx[k, i], self.Vy[k, i] = p.X, p.Y, p.Vx, p.Vy
+                self.radius[k, i], self.mass[k, i], self.species[k, i] = p.radius, p.mass, p.species
+
+        # Pairs of distinct particles that interact, each counted once
+        self.pairs = self.mask[:, :, None] & self.mask[:, None, :] & np.triu(np.ones((max_particles, max_particles), dtype=bool), 1)
+        if self.interactions is not None:
+            self.pairs &= self.interactions[self.species[:, :, None], self.species[:, None, :]]
+
+
+if __name__ == "__main__":
+    from random import seed
+    from time import perf_counter
+
+    from Space import Space
+
+    seed(0)
+    K, N, T = 200, 20, 1
+
+    # Simulate spaces one at a time
+    start = perf_counter()
+    for _ in range(K):
+        space = Space(N, width=100, height=100)
+        space.simulate(T)
+    sequential = perf_counter() - start
+
+    # Simulate spaces together
+    start = perf_counter()
+    batch = BatchSpace(K, N, width=100, height=100)
+    energy = batch.summary()['energy']
+    batch.simulate(T)
+    batched = perf_counter() - start
+    summary = batch.summary()
+
+    # Particles of spaces with random sizes must be generated inside their space
+    sizes = BatchSpace(K, N, width=(80, 120), height=(80, 120))
+    width, height = sizes.width[:, None] - sizes.radius, sizes.height[:, None] - sizes.radius
+    inside = (sizes.X >= sizes.radius) & (sizes.X <= width) & (sizes.Y >= sizes.radius) & (sizes.Y <= height)
+    assert inside[sizes.mask].all(), "%d particles generated outside their space" % (~inside[sizes.mask]).sum()
+
+    print("Sequential: %.2f seconds" % sequential)
+    print("Batched: %.2f seconds" % batched)
+    print("Max relative energy error:", np.abs(summary['energy'] / energy - 1).max())
+    print("Mean collisions per space:", summary['particle_collisions'].mean(), summary['boundary_collisions'].mean())
@@ -6,13 +6,13 @@ Github: aijac0
 Email: aidancollinscs@gmail.com
 """
 
-from sympy import Symbol, Eq, solve
-
 from Event import Event
 
 
 class BoundaryCollision(Event):
     
+    __slots__ = ('target', 'time', 'x_hit', 'y_hit')
+    
     def __init__(self, target, time, x_hit, y_hit):
         """
         Instantiate a BoundaryCollision object.
@@ -22,6 +22,19 @@ class BoundaryCollision(Event):
             x_hit (int): Whether or not particle collided with X boundary.
             y_hit (int): Whether or not particle collided with Y boundary.
         """
+        self.set(target, time, x_hit, y_hit)
+        
+        
+    def set(self, target, time, x_hit, y_hit):
+        """
+        Set attributes of BoundaryCollision object.
+
+        Args:
+            target (Particle): Particle involved in event.
+            time (float): Time until event.
+            x_hit (int): Whether or not particle collided with X boundary.
+            y_hit (int): Whether or not particle collided with Y boundary.
+        """
         self.target = target
         self.time = time
         self.x_hit = x_hit
@@ -72,10 +85,31 @@ class BoundaryCollision(Event):
     
         
     @classmethod
-    def get_event(cls, p, width, height, min_x, min_y, max_x, max_y):
+    def get_event(cls, p, width, height, *args):
         """
         Get event representing the soonest instance of particle colliding with space boundary. 
 
+        Args:
+            p (Particle): Particle to find event for.
+            width (int): Width of space.
+            height (int): Height of space.
+            args: Additional args returned by is_possible().
+
+        Returns:
+            Event: Event representing soonest collision with boundary, or None.
+        """
+        
+        # Create event object if collision occured
+        sol = cls.solve(p, width, height, *args)
+        if sol:
+            return cls(p, *sol)
+    
+    
+    @classmethod
+    def solve(cls, p, width, height, min_x, min_y, max_x, max_y):
+        """
+        Get the soonest instance of particle colliding with space boundary, without creating an event. 
+
         Args:
             p (Particle): Particle to find event for.
             width (int): Width of space.
@@ -86,45 +120,37 @@ class BoundaryCollision(Event):
             max_y (bool): If collision with maximum Y boundary is possible.
 
         Returns:
-            Event: Event representing soonest collision with boundary, or None.
+            tuple: Time of collision and whether particle collides with X,Y boundaries, or None.
         """
         
-        # Time variable
-        t = Symbol('t', positive=True)
-        
         # Minimum distance between particle and boundary before collision
         d = p.radius
         
-        # Times that particle collides between X,Y boundaries
-        x_sols = set()
-        y_sols = set()
+        # Times that particle collides with X,Y boundaries; only the soonest of each is needed
+        x_sol = y_sol = None
         
         # Get time that particle collides with minimum X boundary
         if min_x:
-            sol = (d - p.X) / p.Vx
-            x_sols.add(sol)
+            x_sol = (d - p.X) / p.Vx
                 
         # Get time that particle collides with maximum X boundary
         if max_x:
             sol = (width - d - p.X) / p.Vx
-            x_sols.add(sol)
+            x_sol = sol if x_sol is None else min(x_sol, sol)
         
         # Get time that particle collides with minimum Y boundary
         if min_y:
-            sol = (d - p.Y) / p.Vy
-            y_sols.add(sol)
+            y_sol = (d - p.Y) / p.Vy
                 
         # Get time that particle collides with maximum Y boundary
         if max_y:
             sol = (height - d - p.Y) / p.Vy
-            y_sols.add(sol)
+            y_sol = sol if y_sol is None else min(y_sol, sol)
         
-        # Create event object if collision occured
-        if x_sols and y_sols:
-            x_sol = min(x_sols)
-            y_sol = min(y_sols)
-            return cls(p, cls.round_down(min(x_sol, y_sol), 3), x_sol <= y_sol, y_sol <= x_sol)
-        elif x_sols:
-            return cls(p, cls.round_down(min(x_sols), 3), True, False)
-        elif y_sols:
-            return cls(p, cls.round_down(min(y_sols), 3), False, True)
\ No newline at end of file
+        # Return soonest collision if collision occured
+        if x_sol is not None and y_sol is not None:
+            return cls.round_down(min(x_sol, y_sol), 3), x_sol <= y_sol, y_sol <= x_sol
+        elif x_sol is not None:
+            return cls.round_down(x_sol, 3), True, False
+        elif y_sol is not None:
+            return cls.round_down(y_sol, 3), False, True
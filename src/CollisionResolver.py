@@ -0,0 +1,208 @@
+"""
+Implementation of CollisionResolver class and methods.
+File: CollisionResolver.py
+Author: Aidan Collins
+Github: aijac0
+Email: aidancollinscs@gmail.com
+"""
+
+import numpy as np
+
+from BoundaryCollision import BoundaryCollision
+from ParticleCollision import ParticleCollision
+from ObstacleCollision import ObstacleCollision
+
+
+class CollisionResolver:
+
+    # Event types in the order they are batched
+    categories = (ParticleCollision, BoundaryCollision, ObstacleCollision)
+
+    # Smallest number of particle collisions in a batch that are faster to simulate with arrays than one at a time
+    threshold = 16
+
+    @classmethod
+    def resolve(cls, events):
+        """
+        Simulate simultaneous collision events in batches.
+        Events sharing a particle are placed in successive batches in the order they were found.
+        Batches with fewer particle collisions than threshold, and boundary and obstacle collisions,
+        are simulated one event at a time, which is faster.
+
+        Args:
+            events (list): Simultaneous BoundaryCollision, ObstacleCollision and ParticleCollision events.
+        """
+
+        # Simulate events one at a time if no batch can reach threshold
+        if sum(isinstance(event, ParticleCollision) for event in events) < cls.threshold:
+            for event in events:
+                event.simulate()
+            return
+
+        # Simulate each batch of non-conflicting events
+        for pairs, walls, obstacles in cls.group(events):
+            if len(pairs) >= cls.threshold:
+                cls.resolve_pairs(pairs)
+            else:
+                for event in pairs:
+                    event.simulate()
+            for event in walls + obstacles:
+                event.simulate()
+
+
+    @classmethod
+    def group(cls, events):
+        """
+        Group events into batches where no two events share a particle.
+
+        Args:
+            events (list): Events to group.
+
+        Returns:
+            list: Particle, boundary and obstacle collisions of each batch.
+        """
+
+        # Batches of events, the last batch each particle is involved in, and the list of each event type
+        batches = []
+        last = {}
+        category = {event_cls: i for i, event_cls in enumerate(cls.categories)}
+
+        # Place each event in the batch after the last batch involving its particles
+        for event in events:
+            if type(event) is ParticleCollision:
+                a, b = id(event.p1), id(event.p2)
+                i = max(last.get(a, -1), last.get(b, -1)) + 1
+                last[a] = last[b] = i
+            else:
+                a = id(event.target)
+                i = last.get(a, -1) + 1
+                last[a] = i
+            if i == len(batches):
+                batches.append(([], [], []))
+            batches[i][category[type(event)]].append(event)
+
+        return batches
+
+
+    @classmethod
+    def resolve_pairs(cls, events):
+        """
+        Simulate particle collisions using elastic impulses.
+        No two events may share a particle.
+        As with ParticleCollision.simulate(), pairs that are already separating, which are found when particles overlap,
+        are left unchanged.
+
+        Args:
+            events (list(ParticleCollision)): Particle collisions to simulate.
+        """
+
+        # Particles involved in collisions
+        p1 = [event.p1 for event in events]
+        p2 = [event.p2 for event in events]
+
+        # Positions, velocities and masses of particles
+        X1, Y1, Vx1, Vy1, m1 = np.array([(p.X, p.Y, p.Vx, p.Vy, p.mass) for p in p1], dtype=np.float64).T
+        X2, Y2, Vx2, Vy2, m2 = np.array([(p.X, p.Y, p.Vx, p.Vy, p.mass) for p in p2], dtype=np.float64).T
+
+        # Unit normal along the axes of collision
+        Nx, Ny = X1 - X2, Y1 - Y2
+        d = np.hypot(Nx, Ny)
+        Nx, Ny = Nx / d, Ny / d
+
+        # Impulse exchanged along the normal; separating particles are left unchanged
+        J = 2 * m1 * m2 / (m1 + m2) * np.minimum((Vx1 - Vx2) * Nx + (Vy1 - Vy2) * Ny, 0)
+
+        # Velocities after collision
+        Vx1, Vy1 = Vx1 - J / m1 * Nx, Vy1 - J / m1 * Ny
+        Vx2, Vy2 = Vx2 + J / m2 * Nx, Vy2 + J / m2 * Ny
+
+        # Store velocities in particles
+        for p, Vx, Vy in zip(p1, Vx1.tolist(), Vy1.tolist()):
+            p.Vx, p.Vy = Vx, Vy
+        for p, Vx, Vy in zip(p2, Vx2.tolist(), Vy2.tolist()):
+            p.Vx, p.Vy = Vx, Vy
+
+
+if __name__ == "__main__":
+    from copy import deepcopy
+    from math import pi
+    from random import uniform, seed
+    from timeit import repeat
+
+    from Particle import Particle
+    from Space import Space
+
+    seed(0)
+
+    # Create colliding pairs of particles with random velocities, so some pairs are separating
+    def colliding_pairs(n):
+        events = []
+        for _ in range(n):
+            p1 = Particle('b', uniform(1, 10), 1, 0, 0, *Particle.vector_components(uniform(1, 50), uniform(0, 2 * pi)))
+            p2 = Particle('r', uniform(1, 10), 1, *Particle.vector_components(2, uniform(0, 2 * pi)),
+                          *Particle.vector_components(uniform(1, 50), uniform(0, 2 * pi)))
+            events.append(ParticleCollision([p1, p2], 0))
+        return events
+
+    # Time to simulate particle collisions one at a time, always in batches, and with threshold
+    threshold = CollisionResolver.threshold
+    print("Pairs  One at a time (us)  Batched (us)  Threshold %d (us)" % threshold)
+    for n in (1, 2, 4, 8, 16, 32, 64, 128):
+        events = colliding_pairs(n)
+        number = max(10000 // n, 10)
+        times = [min(repeat(lambda: [event.simulate() for event in events], number=number, repeat=5))]
+        for CollisionResolver.threshold in (1, threshold):
+            times.append(min(repeat(lambda: CollisionResolver.resolve(events), number=number, repeat=5)))
+        print("%5d  %18.1f  %12.1f  %16.1f" % (n, *(t / number * 1e6 for t in times)))
+
+    # Velocities, kinetic energy and momentum of particles
+    def state(particles):
+        V = [(p.Vx, p.Vy) for p in particles]
+        KE = sum(0.5 * p.mass * (p.Vx ** 2 + p.Vy ** 2) for p in particles)
+        P = (sum(p.mass * p.Vx for p in particles), sum(p.mass * p.Vy for p in particles))
+        return V, KE, P
+
+    # Particle collisions with arrays must match simulating them one at a time
+    events = colliding_pairs(1000)
+    sequential = deepcopy(events)
+    for event in sequential:
+        event.simulate()
+    CollisionResolver.resolve_pairs(events)
+    for e1, e2 in zip(sequential, events):
+        V1, KE1, P1 = state(e1.targets)
+        V2, KE2, P2 = state(e2.targets)
+        assert abs(KE1 - KE2) <= 1e-9 * KE1
+        assert all(abs(a - b) <= 1e-9 * (abs(KE1) + 1) for a, b in zip(P1, P2))
+        assert all(abs(a - b) <= 1e-9 * (abs(a) + 1) for v1, v2 in zip(V1, V2) for a, b in zip(v1, v2))
+
+    # Simulate dense space with batched collisions, comparing every step with simulating events one at a time
+    CollisionResolver.threshold = 1
+    space = Space(60, width=150, height=150, batch_collisions=True)
+    steps = 0
+    for _ in range(300):
+        manager = space.manager
+        manager.get_events(space.particles, 1 / 30, space.width, space.height)
+        for p in space.particles:
+            p.simulate(manager.time)
+
+        # Simulate events one at a time, then restore velocities and simulate events in batches
+        before = [(p.Vx, p.Vy) for p in space.particles]
+        for event in manager.events:
+            event.simulate()
+        V1, KE1, P1 = state(space.particles)
+        for p, (Vx, Vy) in zip(space.particles, before):
+            p.Vx, p.Vy = Vx, Vy
+        CollisionResolver.resolve(manager.events)
+        V2, KE2, P2 = state(space.particles)
+
+        # Energy, momentum and velocities match; separating pairs are left unchanged by both
+        assert abs(KE1 - KE2) <= 1e-9 * KE1
+        assert all(abs(a - b) <= 1e-9 * KE1 for a, b in zip(P1, P2))
+        assert all(abs(a - b) <= 1e-9 * (abs(a) + 1) for v1, v2 in zip(V1, V2) for a, b in zip(v1, v2))
+        steps += len(manager.events) > 0
+
+    # Kinetic energy is conserved over a whole simulation with batched collisions
+    KE = state(space.particles)[1]
+    space.simulate(10)
+    assert abs(state(space.particles)[1] - KE) <= 1e-9 * KE
+    print("Checked %d event steps: energy, momentum and velocities match" % steps)
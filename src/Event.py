@@ -12,6 +12,9 @@ from math import floor, pow
 
 class Event(ABC):
     
+    # Events store attributes in slots, and are reused by EventManager
+    __slots__ = ()
+    
     @abstractmethod
     def simulate(cls):
         """
@@ -33,6 +36,20 @@ class Event(ABC):
         """
         pass
     
+    @abstractclassmethod
+    def solve(cls):
+        """
+        Get the time and attributes of the next event, without creating an event.
+        """
+        pass
+    
+    @abstractmethod
+    def set(self):
+        """
+        Set attributes of event, so that event can be reused.
+        """
+        pass
+    
     def round_down(num, precision):
         
         exp = pow(10, precision)
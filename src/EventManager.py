@@ -6,26 +6,43 @@ Github: aijac0
 Email: aidancollinscs@gmail.com
 """
 
+from bisect import bisect_right
+
 from ParticleCollision import ParticleCollision
 from BoundaryCollision import BoundaryCollision
+from ObstacleCollision import ObstacleCollision
+from Particle import Particle
 
 
 class EventManager:
     
-    def __init__(self, b_collision=True, p_collision=True, **kwargs):
+    def __init__(self, b_collision=True, p_collision=True, index=None, interactions=None, **kwargs):
         """
         Instantiate an EventManager object.
 
         Args:
             b_collision (bool, optional): Turn on boundary collision. Defaults to True.
             p_collision (bool, optional): Turn on particle collision. Defaults to True.
+            index (ObstacleIndex, optional): Index of obstacles in space. Defaults to None.
+            interactions (list(list(bool)), optional): Whether each pair of species collide. Defaults to None.
         """
         
+        # Species interactions must be given for every species generated
+        if interactions is not None:
+            species = kwargs.get('species')
+            self.check_interactions(interactions, len(species) if species else len(kwargs.get('color_r', Particle.colors)))
+        
         # Attributes
         self.events = []
         self.time = 0
         self.single_cls = []
         self.multiple_cls = []
+        self.index = index if index else None
+        self.interactions = interactions
+        self.__particles = None
+        self.__groups = {}
+        self.__partners = None
+        self.__pool = {ParticleCollision: [], BoundaryCollision: [], ObstacleCollision: []}
         
         # If boundary collision is enabled
         if b_collision:
@@ -36,9 +53,34 @@ class EventManager:
             self.multiple_cls.append(ParticleCollision)
         
         
+    @classmethod
+    def check_interactions(cls, interactions, n_species):
+        """
+        Determine if interaction matrix is valid for specified number of species.
+
+        Args:
+            interactions (list(list(bool))): Whether each pair of species collide.
+            n_species (int): Number of species.
+
+        Raises:
+            ValueError: Interaction matrix is not square and symmetric, or does not have a row for every species.
+        """
+        
+        # Species interactions must be symmetric
+        n = len(interactions)
+        if any(len(row) != n or any(bool(row[j]) != bool(interactions[j][i]) for j in range(n))
+               for i, row in enumerate(interactions)):
+            raise ValueError("Interaction matrix must be square and symmetric")
+        
+        # Every species must have a row
+        if n != n_species:
+            raise ValueError("Interaction matrix is %sx%s, but there are %s species" % (n, n, n_species))
+        
+        
     def get_events(self, particles, t, width, height):
         """
         Get the soonest events within timeframe.
+        Events are reused, so events found by a previous call are no longer valid.
 
         Args:
             particles (list): Particles to find events for.
@@ -47,51 +89,277 @@ class EventManager:
             height (int): Height of space.
         """
         
-        # List to store events occuring at specified time
-        self.events = []
+        # Release previous events, and store events occuring at specified time
+        self.__release_events()
         self.time = t
         
+        # Particles each species interacts with
+        partners = self.__get_partners(particles)
+        
         # Iterate over every particle
         for i in range(len(particles)):
             p1 = particles[i]
             
             # Get events involving p1
             for event_cls in self.single_cls:
-                self.__get_event(event_cls, [p1], width, height)
+                self.__get_single_event(event_cls, p1, width, height)
+                
+            # Get obstacle collisions involving p1
+            if self.index is not None:
+                self.__get_obstacle_event(p1)
             
-            # Iterate over every other particle
-            for j in range(i + 1, len(particles)):
+            # Iterate over every other particle that p1 interacts with
+            if not self.multiple_cls:
+                continue
+            if partners is None:
+                candidates = range(i + 1, len(particles))
+            else:
+                candidates = partners[p1.species]
+                candidates = candidates[bisect_right(candidates, i):]
+            for j in candidates:
                 p2 = particles[j]
                 
                 # Get events involving p1 and p2
                 for event_cls in self.multiple_cls:
-                    self.__get_event(event_cls, [p1, p2], width, height)
+                    self.__get_pair_event(event_cls, p1, p2, width, height)
+
+    
+    def __get_partners(self, particles):
+        """
+        Get the particles that each species interacts with, so other pairs are never considered.
+
+        Args:
+            particles (list): Particles to find events for.
+
+        Returns:
+            dict: Sorted indices of particles each species interacts with, or None if every pair interacts.
+        """
+        
+        # Every pair interacts
+        if self.interactions is None:
+            return None
+        
+        # Reuse partners until particles change
+        if particles is not self.__particles or len(particles) != sum(map(len, self.__groups.values())):
+            self.__particles = particles
+            
+            # Indices of particles of each species
+            self.__groups = {}
+            for i, p in enumerate(particles):
+                self.__groups.setdefault(p.species, []).append(i)
+            
+            # Merge indices of every species each species interacts with
+            self.__partners = {s1: sorted(i for s2, group in self.__groups.items() if self.interactions[s1][s2] for i in group)
+                               for s1 in self.__groups}
+        
+        return self.__partners
 
     
-    def __get_event(self, event_cls, targets, width, height):
+    def __get_single_event(self, event_cls, p, width, height):
         """
-        Get and handle the result of finding event.
+        Get and handle the result of finding event involving one particle.
 
         Args:
             event_cls (Event): Event to find.
-            targets (tuple): Particles to find event for.
+            p (Particle): Particle to find event for.
             width (int): Width of space.
             height (int): Height of space.
         """
         
         # Determine if event is possible
-        is_possible, args = event_cls.is_possible(*targets, self.time, width, height)
+        is_possible, args = event_cls.is_possible(p, self.time, width, height)
         
-        # If event is possible
+        # If event is possible, get soonest instance of event
         if is_possible:
+            sol = event_cls.solve(p, width, height, *args)
             
-            # Get soonest instance of event.
-            event = event_cls.get_event(*targets, width, height, *args)
+            # Store event if it occurs soonest
+            if sol and sol[0] <= self.time:
+                self.__store_event(event_cls, sol).set(p, *sol)
+                
+                
+    def __get_pair_event(self, event_cls, p1, p2, width, height):
+        """
+        Get and handle the result of finding event involving two particles.
+
+        Args:
+            event_cls (Event): Event to find.
+            p1 (Particle): First particle to find event for.
+            p2 (Particle): Second particle to find event for.
+            width (int): Width of space.
+            height (int): Height of space.
+        """
+        
+        # Determine if event is possible
+        is_possible, args = event_cls.is_possible(p1, p2, self.time, width, height)
+        
+        # If event is possible, get soonest instance of event
+        if is_possible:
+            sol = event_cls.solve(p1, p2, width, height, *args)
+            
+            # Store event if it occurs soonest
+            if sol and sol[0] <= self.time:
+                self.__store_event(event_cls, sol).set(p1, p2, *sol)
             
-            # Determine if event occurs sooner than previously stored events.
-            if event:
-                if event.time < self.time:
-                    self.events = [event]
-                    self.time = event.time
-                elif event.time == self.time:
-                    self.events.append(event)
\ No newline at end of file
+            
+    def __get_obstacle_event(self, p):
+        """
+        Get and handle the result of finding obstacle collision.
+
+        Args:
+            p (Particle): Particle to find event for.
+        """
+        
+        # Determine if event is possible using nearby obstacles only
+        is_possible, args = ObstacleCollision.is_possible(p, self.time, self.index)
+        
+        # If event is possible, get soonest instance of event
+        if is_possible:
+            sol = ObstacleCollision.solve(p, self.index, *args)
+            
+            # Store event if it occurs soonest
+            if sol and sol[0] <= self.time:
+                self.__store_event(ObstacleCollision, sol).set(p, *sol)
+            
+            
+    def __store_event(self, event_cls, sol):
+        """
+        Store event occuring no later than previously stored events.
+        Events are taken from the pool of released events, and only created when the pool is empty.
+
+        Args:
+            event_cls (Event): Event to store.
+            sol (tuple): Time and attributes of event.
+
+        Returns:
+            Event: Stored event, whose attributes must be set.
+        """
+        
+        # Release previously stored events if event occurs sooner
+        if sol[0] < self.time:
+            self.__release_events()
+            self.time = sol[0]
+            
+        # Reuse released event, or create event
+        pool = self.__pool[event_cls]
+        event = pool.pop() if pool else event_cls.__new__(event_cls)
+        self.events.append(event)
+        return event
+    
+    
+    def __release_events(self):
+        """
+        Return stored events to the pool, so they can be reused.
+        """
+        
+        for event in self.events:
+            self.__pool[type(event)].append(event)
+        self.events.clear()
+
+
+if __name__ == "__main__":
+    from random import seed
+    from time import perf_counter
+    import sys, tracemalloc
+    
+    from Event import Event
+    from Space import Space
+    
+    def unslotted(cls, base):
+        """
+        Copy of a slotted class that stores its attributes in a per-object dict, as before slots were used.
+        """
+        
+        attrs = {k: v for k, v in vars(cls).items()
+                 if k not in cls.__slots__ and k not in ('__slots__', '__abstractmethods__', '_abc_impl')}
+        return type(cls.__name__, (base,), attrs)
+    
+    # Particles and events as they were before slots and pooling
+    DictParticle = unslotted(Particle, object)
+    DictBoundaryCollision = unslotted(BoundaryCollision, Event)
+    DictParticleCollision = unslotted(ParticleCollision, Event)
+    
+    def get_events_unpooled(particles, t, width, height):
+        """
+        Get the soonest events as before pooling, creating a new event for every candidate that occurs.
+        """
+        
+        events = []
+        for i in range(len(particles)):
+            for j in range(i, len(particles)):
+                targets = [particles[i]] if i == j else [particles[i], particles[j]]
+                event_cls = DictBoundaryCollision if i == j else DictParticleCollision
+                is_possible, args = event_cls.is_possible(*targets, t, width, height)
+                if is_possible:
+                    event = event_cls.get_event(*targets, width, height, *args)
+                    if event and event.time < t:
+                        events, t = [event], event.time
+                    elif event and event.time == t:
+                        events.append(event)
+        return events
+    
+    def measure(size):
+        """
+        Memory used by each of a number of particles created by size().
+        """
+        
+        tracemalloc.start()
+        particles = [size(i) for i in range(10000)]
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return (used - sys.getsizeof(particles)) / len(particles)
+    
+    def run(path):
+        """
+        Simulate a seeded space, searching for events along both paths, and report the searches made along path.
+        """
+        
+        seed(0)
+        space = Space(40, width=150, height=150)
+        manager = space.manager
+        get_events = manager.get_events
+        paths = {'before': get_events_unpooled, 'after': get_events}
+        
+        # Search along both paths from the same state, so the simulation itself is unchanged
+        stats = {name: [0, 0, 0.0] for name in paths}
+        def search(particles, t, width, height):
+            for name, find in paths.items():
+                if path == 'time':
+                    start = perf_counter()
+                    find(particles, t, width, height)
+                    stats[name][2] += perf_counter() - start
+                    continue
+                
+                # Count allocations still held once the search returns, and the peak of those freed within it
+                ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+                before = tracemalloc.take_snapshot().filter_traces(ignore)
+                current, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                result = find(particles, t, width, height)
+                _, peak = tracemalloc.get_traced_memory()
+                after = tracemalloc.take_snapshot().filter_traces(ignore)
+                stats[name][0] += sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+                stats[name][1] += peak - current
+                del result
+        manager.get_events = search
+        
+        for _ in range(300):
+            space.simulate(1 / 30)
+        return stats, len(space.log)
+    
+    # Memory used by each particle
+    sizes = {'before': measure(lambda i: DictParticle('b', 1.0, 1.0, float(i), float(i), 1.0, 1.0)),
+             'after': measure(lambda i: Particle('b', 1.0, 1.0, float(i), float(i), 1.0, 1.0))}
+    
+    # Allocations and time of event searches
+    tracemalloc.start()
+    allocations, n_events = run('allocations')
+    tracemalloc.stop()
+    times, _ = run('time')
+    
+    print("Events simulated:", n_events)
+    print("%-36s %10s %10s" % ("", "Before", "After"))
+    print("%-36s %10.1f %10.1f" % ("Bytes per particle", sizes['before'], sizes['after']))
+    print("%-36s %10.2f %10.2f" % ("Allocations held per simulated event", *(allocations[k][0] / n_events for k in sizes)))
+    print("%-36s %10.1f %10.1f" % ("Peak bytes per simulated event", *(allocations[k][1] / n_events for k in sizes)))
+    print("%-36s %10.2f %10.2f" % ("Event search seconds", *(times[k][2] for k in sizes)))
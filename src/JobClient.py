@@ -0,0 +1,118 @@
+"""
+Implementation of JobClient class and methods.
+File: JobClient.py
+Author: Aidan Collins
+Github: aijac0
+Email: aidancollinscs@gmail.com
+"""
+
+from multiprocessing.connection import Client
+from collections import deque
+
+from JobServer import JobServer
+
+
+class JobClient:
+
+    def __init__(self, address=None, authkey=None):
+        """
+        Instantiate a JobClient object connected to a JobServer.
+
+        Args:
+            address (str/tuple, optional): Address of server. Defaults to JobServer.address.
+            authkey (bytes, optional): Key to authenticate with. Defaults to None.
+        """
+
+        # Attributes
+        self.conn = Client(address or JobServer.address, authkey=authkey)
+        self.pending = deque()
+        self.finished = set()
+
+
+    def submit(self, filename, priority=0, cores=1, stream=False, render=None, **params):
+        """
+        Submit a simulation to the server.
+
+        Args:
+            filename (str): File to store rendered frames.
+            priority (int, optional): Jobs with higher priority are started first. Defaults to 0.
+            cores (int, optional): Number of cores reserved while job runs. Defaults to 1.
+            stream (bool, optional): Stream positions of particles in each frame. Defaults to False.
+            render (dict, optional): Arguments passed to Simulation.simulate(). Defaults to None.
+            params: Arguments passed to the Simulation constructor.
+
+        Returns:
+            int: Identifier of job.
+        """
+
+        # Send job to server
+        config = {'params': params, 'filename': filename, 'render': render or {}, 'stream': stream}
+        self.conn.send(('submit', config, priority, cores))
+
+        # Wait for job to be acknowledged, keeping messages of other jobs
+        while True:
+            kind, job_id, payload = self.conn.recv()
+            if kind == 'accepted':
+                return job_id
+            if kind == 'rejected':
+                self.pending.append(('error', job_id, payload))
+                return job_id
+            self.pending.append((kind, job_id, payload))
+
+
+    def cancel(self, job_id):
+        """
+        Cancel a queued or running job.
+
+        Args:
+            job_id (int): Identifier of job.
+        """
+
+        self.conn.send(('cancel', job_id))
+
+
+    def messages(self, job_ids):
+        """
+        Generator for messages from server until every specified job has finished.
+        Each message is a tuple of kind, job identifier and payload, where kind is one of
+        'started', 'progress', 'frames', 'done', 'cancelled' or 'error'.
+
+        Args:
+            job_ids (list): Identifiers of jobs to receive messages for.
+
+        Yields:
+            tuple: Message from server.
+        """
+
+        # Jobs that have not finished
+        remaining = set(job_ids) - self.finished
+
+        # Yield messages until every job has finished
+        while remaining:
+            message = self.pending.popleft() if self.pending else self.conn.recv()
+            kind, job_id, _ = message
+            if kind in ('done', 'cancelled', 'error'):
+                self.finished.add(job_id)
+                remaining.discard(job_id)
+            yield message
+
+
+    def close(self):
+        """
+        Disconnect from server, cancelling unfinished jobs.
+        """
+
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Submit simulation with arguments given as key=value, and report its progress
+    params = dict(arg.split('=', 1) for arg in sys.argv[2:])
+    params = {key: float(value) if '.' in value else int(value) for key, value in params.items()}
+    client = JobClient()
+    job_id = client.submit(sys.argv[1], **params)
+    for kind, _, payload in client.messages([job_id]):
+        print(kind, payload if payload is not None else '')
+    client.close()
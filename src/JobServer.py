@@ -0,0 +1,420 @@
+"""
+Implementation of JobServer class and methods.
+File: JobServer.py
+Author: Aidan Collins
+Github: aijac0
+Email: aidancollinscs@gmail.com
+"""
+
+from multiprocessing import AuthenticationError, get_context
+from multiprocessing.connection import Listener
+from threading import Condition, Thread
+from queue import Queue
+from contextlib import redirect_stdout
+from heapq import heappush, heappop
+from itertools import count
+from os import chmod, cpu_count, devnull, path, remove
+import errno
+import socket
+import sys
+
+
+class JobCancelled(Exception):
+    """
+    Raised within a worker when its running job is cancelled.
+    """
+    pass
+
+
+class JobServer:
+
+    # Unix socket that clients connect to by default
+    address = '/tmp/physics_simulation.sock'
+
+    def __init__(self, address=None, cores=None, authkey=None):
+        """
+        Instantiate a JobServer object.
+        One warm worker process is kept per core, and jobs are started in priority order while enough cores are free.
+
+        Args:
+            address (str/tuple, optional): Unix socket path, or (host, port) to listen on. Defaults to JobServer.address.
+            cores (int, optional): Number of cores that running jobs may use. Defaults to the number of CPUs.
+            authkey (bytes, optional): Key that clients must authenticate with. Required for (host, port) addresses.
+                Defaults to None.
+        """
+
+        # Clients send pickled jobs, so only authenticated clients may connect over TCP
+        if not isinstance(address or JobServer.address, str) and not authkey:
+            raise ValueError("An authkey is required to listen on a (host, port) address")
+
+        # Attributes
+        self.address = address or JobServer.address
+        self.cores = cores or cpu_count()
+        self.authkey = authkey
+        self.free = self.cores
+        self.queue = []
+        self.jobs = {}
+        self.workers = []
+        self.running = False
+        self.lock = Condition()
+        self.ids = count(1)
+        self.context = get_context('spawn')
+        self.listener = None
+
+
+    def serve(self):
+        """
+        Start workers and accept clients until shutdown() is called.
+        """
+
+        # Remove stale socket left by a previous server, unless a server is still listening on it
+        if isinstance(self.address, str) and path.exists(self.address):
+            try:
+                self.__connect(self.address)
+            except OSError:
+                remove(self.address)
+            else:
+                raise OSError(errno.EADDRINUSE, "Another server is listening on " + self.address)
+
+        # Only the user running the server may connect to its Unix socket
+        self.listener = Listener(self.address, authkey=self.authkey)
+        if isinstance(self.address, str):
+            chmod(self.address, 0o600)
+
+        # Start workers and scheduler
+        self.running = True
+        for _ in range(self.cores):
+            self.__start_worker()
+        Thread(target=self.__schedule, daemon=True).start()
+
+        # Handle each client on its own thread
+        try:
+            while True:
+
+                # Ignore clients that fail to connect or authenticate
+                try:
+                    conn = self.listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    if not self.running:
+                        break
+                    continue
+
+                # Stop once woken by shutdown()
+                if not self.running:
+                    conn.close()
+                    break
+                Thread(target=self.__handle, args=(conn,), daemon=True).start()
+        finally:
+            self.shutdown()
+
+
+    def shutdown(self):
+        """
+        Stop accepting clients and stop every worker.
+        """
+
+        with self.lock:
+            if not self.running:
+                return
+            self.running = False
+            self.lock.notify_all()
+
+            # Stop workers; running jobs are abandoned
+            for worker in self.workers:
+                try:
+                    worker['conn'].send(None)
+                except OSError:
+                    pass
+
+        # Stop accepting clients, waking serve() if it is waiting for a client
+        try:
+            self.__connect(self.listener.address)
+        except OSError:
+            pass
+        self.listener.close()
+        for worker in self.workers:
+            worker['process'].join(timeout=5)
+            if worker['process'].is_alive():
+                worker['process'].terminate()
+
+
+    def submit(self, outbox, config, priority=0, cores=1):
+        """
+        Queue a job and acknowledge it to its client.
+
+        Args:
+            outbox (Queue): Messages to be sent to client that submitted job.
+            config (dict): Simulation parameters, filename and rendering arguments.
+            priority (int, optional): Jobs with higher priority are started first. Defaults to 0.
+            cores (int, optional): Number of cores reserved while job runs. Defaults to 1.
+
+        Returns:
+            int: Identifier of job.
+        """
+
+        with self.lock:
+            job_id = next(self.ids)
+
+            # Job can never be started
+            if not 1 <= cores <= self.cores:
+                outbox.put(('rejected', job_id, "Job requires %s of %s cores" % (cores, self.cores)))
+                return job_id
+
+            # Acknowledge job before any progress can be sent
+            job = {'id': job_id, 'config': config, 'priority': priority, 'cores': cores,
+                   'outbox': outbox, 'worker': None}
+            self.jobs[job_id] = job
+            heappush(self.queue, (-priority, job_id, job))
+            outbox.put(('accepted', job_id, None))
+            self.lock.notify_all()
+
+        return job_id
+
+
+    def cancel(self, job_id):
+        """
+        Cancel a queued or running job.
+
+        Args:
+            job_id (int): Identifier of job.
+        """
+
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+
+            # Remove queued job; it is skipped when reached in the queue
+            if job['worker'] is None:
+                del self.jobs[job_id]
+                job['outbox'].put(('cancelled', job_id, None))
+
+            # Ask worker to stop running job
+            else:
+                job['worker']['conn'].send(('cancel', job_id, None))
+
+
+    @classmethod
+    def work(cls, conn):
+        """
+        Run jobs received from server within a worker process.
+
+        Args:
+            conn (Connection): Connection to server.
+        """
+
+        # Import physics modules once for every job
+        import numpy as np
+        from Simulation import Simulation
+
+        # Run jobs until server stops worker
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            kind, job_id, config = message
+            if kind != 'run':
+                continue
+
+            # Report progress of job, and stop if job is cancelled
+            def callback(i, frames):
+                while conn.poll():
+                    message = conn.recv()
+                    if message is None:
+                        sys.exit()
+                    if message[0] == 'cancel' and message[1] == job_id:
+                        raise JobCancelled()
+                conn.send(('progress', job_id, (i + len(frames) - 1, n_frames - 1)))
+                if config.get('stream'):
+                    conn.send(('frames', job_id, (i, np.array(frames))))
+
+            # Run simulation
+            try:
+                with open(devnull, 'w') as f, redirect_stdout(f):
+                    sim = Simulation(**config['params'])
+                    n_frames = len(sim.frames)
+                    sim.simulate(config['filename'], callback=callback, **config.get('render', {}))
+                conn.send(('done', job_id, {'filename': config['filename'] + '.avi', 'frames': n_frames,
+                                            'events': len(sim.space.log)}))
+            except JobCancelled:
+                conn.send(('cancelled', job_id, None))
+            except Exception as e:
+                conn.send(('error', job_id, repr(e)))
+
+
+    def __start_worker(self):
+        """
+        Start a worker process and a thread forwarding its messages to clients.
+        """
+
+        # Start worker process
+        server_conn, worker_conn = self.context.Pipe()
+        process = self.context.Process(target=JobServer.work, args=(worker_conn,), daemon=True)
+        process.start()
+        worker_conn.close()
+
+        # Record worker
+        worker = {'process': process, 'conn': server_conn, 'job': None}
+        self.workers.append(worker)
+        Thread(target=self.__forward, args=(worker,), daemon=True).start()
+
+
+    def __forward(self, worker):
+        """
+        Forward messages from worker to the clients of its jobs.
+
+        Args:
+            worker (dict): Worker to forward messages from.
+        """
+
+        while True:
+
+            # Get next message; worker has stopped if connection is closed
+            try:
+                kind, job_id, payload = worker['conn'].recv()
+            except (EOFError, OSError):
+                break
+
+            # Forward message to client
+            job = worker['job']
+            if job is None or job['id'] != job_id:
+                continue
+            job['outbox'].put((kind, job_id, payload))
+
+            # Free worker and cores once job has finished
+            if kind in ('done', 'cancelled', 'error'):
+                self.__release(worker)
+
+        # Fail running job and replace worker if it stopped unexpectedly
+        with self.lock:
+            if not self.running:
+                return
+            job = worker['job']
+            if job is not None:
+                job['outbox'].put(('error', job['id'], "Worker stopped unexpectedly"))
+            self.__release(worker)
+            self.workers.remove(worker)
+            self.__start_worker()
+
+
+    def __release(self, worker):
+        """
+        Free worker and the cores of its job.
+
+        Args:
+            worker (dict): Worker whose job has finished.
+        """
+
+        with self.lock:
+            job = worker['job']
+            if job is None:
+                return
+            self.jobs.pop(job['id'], None)
+            self.free += job['cores']
+            worker['job'] = None
+            self.lock.notify_all()
+
+
+    def __schedule(self):
+        """
+        Start queued jobs in priority order while workers and cores are free.
+        """
+
+        with self.lock:
+            while self.running:
+
+                # Discard cancelled jobs at front of queue
+                while self.queue and self.queue[0][1] not in self.jobs:
+                    heappop(self.queue)
+
+                # Start job at front of queue if an idle worker and enough cores are free
+                idle = next((worker for worker in self.workers if worker['job'] is None), None)
+                if self.queue and idle is not None and self.queue[0][2]['cores'] <= self.free:
+                    _, job_id, job = heappop(self.queue)
+                    self.free -= job['cores']
+                    job['worker'] = idle
+                    idle['job'] = job
+                    idle['conn'].send(('run', job_id, job['config']))
+                    job['outbox'].put(('started', job_id, None))
+                    continue
+
+                # Wait for jobs to be queued or finished
+                self.lock.wait()
+
+
+    def __handle(self, conn):
+        """
+        Handle requests from a client until it disconnects.
+
+        Args:
+            conn (Connection): Connection to client.
+        """
+
+        # Messages to client are sent by their own thread, so a client that stops reading never blocks the server
+        outbox = Queue()
+        Thread(target=self.__write, args=(conn, outbox), daemon=True).start()
+
+        # Jobs submitted by client
+        submitted = []
+
+        # Handle each request
+        try:
+            while True:
+                kind, *args = conn.recv()
+                if kind == 'submit':
+                    submitted.append(self.submit(outbox, *args))
+                elif kind == 'cancel':
+                    self.cancel(*args)
+
+        # Cancel unfinished jobs of disconnected client, then stop sending to it
+        except (EOFError, OSError):
+            for job_id in submitted:
+                self.cancel(job_id)
+            outbox.put(None)
+
+
+    @classmethod
+    def __connect(cls, address):
+        """
+        Open and immediately close a connection to address, without sending anything.
+
+        Args:
+            address (str/tuple): Unix socket path, or (host, port) to connect to.
+
+        Raises:
+            OSError: Nothing is listening on address.
+        """
+
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        with socket.socket(family, socket.SOCK_STREAM) as s:
+            s.settimeout(5)
+            s.connect(address)
+
+
+    @classmethod
+    def __write(cls, conn, outbox):
+        """
+        Send queued messages to client until None is queued, ignoring clients that have disconnected.
+
+        Args:
+            conn (Connection): Connection to client.
+            outbox (Queue): Messages to be sent to client.
+        """
+
+        while True:
+            message = outbox.get()
+            if message is None:
+                break
+            try:
+                conn.send(message)
+            except OSError:
+                pass
+        conn.close()
+
+
+if __name__ == "__main__":
+
+    # Serve on specified address and number of cores
+    address = sys.argv[1] if len(sys.argv) > 1 else None
+    cores = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    JobServer(address, cores).serve()
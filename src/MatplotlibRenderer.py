@@ -0,0 +1,158 @@
+"""
+Implementation of MatplotlibRenderer class and methods.
+File: MatplotlibRenderer.py
+Author: Aidan Collins
+Github: aijac0
+Email: aidancollinscs@gmail.com
+"""
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.collections import EllipseCollection, LineCollection, PolyCollection
+from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+import cv2
+
+
+class MatplotlibRenderer:
+
+    def __init__(self, filename, space, fps, ratio=(800,800)):
+        """
+        Instantiate a MatplotlibRenderer object.
+        The canvas, particle collection and static background are created once and reused for every frame.
+
+        Args:
+            filename (str): File to store rendered frames.
+            space (Space): Space containing particles to render.
+            fps (int): Number of frames per second of video.
+            ratio (tuple, optional): Aspect ratio of each frame. Defaults to (800,800).
+        """
+
+        # Create plot
+        self.fig = Figure(figsize=(ratio[0] / 100, ratio[1] / 100), dpi=100, layout='tight')
+        self.canvas = FigureCanvas(self.fig)
+        self.ax = self.fig.add_subplot()
+        self.ax.set_xlim((0, space.width))
+        self.ax.set_ylim((0, space.height))
+        self.ax.get_xaxis().set_visible(False)
+        self.ax.get_yaxis().set_visible(False)
+        self.ax.set_aspect('equal')
+
+        # Plot static obstacles
+        segments = [[(x1, y1), (x2, y2)] for x1, y1, x2, y2 in space.obstacles.segments]
+        disks = [(X, Y, r * 2) for X, Y, r in space.obstacles.circles if r > 0]
+        self.ax.add_collection(PolyCollection(space.obstacles.rings, facecolors='k', edgecolors='k'))
+        self.ax.add_collection(LineCollection(segments, colors='k'))
+        if disks:
+            X, Y, d = zip(*disks)
+            self.ax.add_collection(EllipseCollection(widths=d, heights=d, facecolor='k', angles=0, units='xy',
+                                                     offsets=list(zip(X, Y)), offset_transform=self.ax.transData))
+
+        # Plot particles; animated artists are excluded from the background
+        s = [p.radius * 2 for p in space.particles]
+        c = [p.color for p in space.particles]
+        offsets = [(p.X, p.Y) for p in space.particles]
+        self.particles = EllipseCollection(widths=s, heights=s, facecolor=c, angles=0, units='xy', offsets=offsets,
+                                           offset_transform=self.ax.transData, animated=True)
+        self.ax.add_collection(self.particles)
+
+        # Draw and store static background
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+
+        # View of canvas pixels, updated in place by each draw
+        self.buffer = np.asarray(self.canvas.buffer_rgba())
+
+        # Create stream to video file
+        self.out = cv2.VideoWriter(filename + '.avi', cv2.VideoWriter_fourcc(*'DIVX'), fps, ratio)
+
+
+    def render(self, offsets):
+        """
+        Render frame and store to output stream.
+
+        Args:
+            offsets (list/ndarray): X,Y position of each particle.
+        """
+
+        # Redraw particles over static background
+        self.canvas.restore_region(self.background)
+        self.particles.set_offsets(offsets)
+        self.ax.draw_artist(self.particles)
+        self.canvas.blit(self.ax.bbox)
+
+        # Store canvas pixels
+        self.out.write(cv2.cvtColor(self.buffer, cv2.COLOR_RGBA2BGR))
+
+
+    def render_batch(self, frames):
+        """
+        Render batch of frames and store to output stream.
+
+        Args:
+            frames (ndarray): X,Y position of each particle in each frame.
+        """
+
+        for offsets in frames:
+            self.render(offsets)
+
+
+    def release(self):
+        """
+        Finalize output stream.
+        """
+
+        self.out.release()
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+    from random import seed
+    from os import remove
+
+    from Space import Space
+
+    seed(0)
+    space = Space(50, width=100, height=100)
+    n_frames = 200
+
+    # Positions of particles in each frame
+    frames = []
+    for _ in range(n_frames):
+        space.simulate(1 / 30)
+        frames.append([(p.X, p.Y) for p in space.particles])
+
+    # Render frames by adding a new collection and canvas for every frame
+    fig = Figure(figsize=(8, 8), dpi=100, layout='tight')
+    ax = fig.add_subplot()
+    ax.set_xlim((0, space.width))
+    ax.set_ylim((0, space.height))
+    ax.get_xaxis().set_visible(False)
+    ax.get_yaxis().set_visible(False)
+    ax.set_aspect('equal')
+    s = [p.radius * 2 for p in space.particles]
+    c = [p.color for p in space.particles]
+    out = cv2.VideoWriter('benchmark_previous.avi', cv2.VideoWriter_fourcc(*'DIVX'), 30, (800, 800))
+    start = perf_counter()
+    for offsets in frames:
+        pts = ax.add_collection(EllipseCollection(widths=s, heights=s, facecolor=c, angles=0, units='xy',
+                                                  offsets=offsets, offset_transform=ax.transData))
+        canvas = FigureCanvas(fig)
+        canvas.draw()
+        image = np.frombuffer(bytes(canvas.buffer_rgba()), dtype='uint8').reshape(canvas.get_width_height()[::-1] + (4,))
+        out.write(cv2.cvtColor(image[..., :3], cv2.COLOR_RGB2BGR))
+        pts.remove()
+    out.release()
+    previous = perf_counter() - start
+
+    # Render frames with persistent canvas
+    renderer = MatplotlibRenderer('benchmark_current', space, 30)
+    start = perf_counter()
+    for offsets in frames:
+        renderer.render(offsets)
+    renderer.release()
+    current = perf_counter() - start
+
+    print("Previous: %.1f frames per second" % (n_frames / previous))
+    print("Current: %.1f frames per second" % (n_frames / current))
+    remove('benchmark_previous.avi')
+    remove('benchmark_current.avi')
@@ -0,0 +1,106 @@
+"""
+Implementation of Obstacle classes and methods.
+File: Obstacle.py
+Author: Aidan Collins
+Github: aijac0
+Email: aidancollinscs@gmail.com
+"""
+
+
+class Segment:
+
+    def __init__(self, x1, y1, x2, y2):
+        """
+        Instantiate a Segment obstacle.
+
+        Args:
+            x1 (float): X position of first endpoint.
+            y1 (float): Y position of first endpoint.
+            x2 (float): X position of second endpoint.
+            y2 (float): Y position of second endpoint.
+        """
+
+        self.x1, self.y1 = x1, y1
+        self.x2, self.y2 = x2, y2
+
+
+    def __repr__(self):
+        return "Segment(%r, %r, %r, %r)" % (self.x1, self.y1, self.x2, self.y2)
+
+
+    def primitives(self):
+        """
+        Get the primitives making up the obstacle.
+
+        Returns:
+            tuple: Segments as (x1, y1, x2, y2), and circles as (X, Y, radius).
+        """
+
+        # Endpoints are zero radius circles so particles can collide with segment ends
+        segments = [(self.x1, self.y1, self.x2, self.y2)]
+        circles = [(self.x1, self.y1, 0), (self.x2, self.y2, 0)]
+        return segments, circles
+
+
+class Polygon:
+
+    def __init__(self, points):
+        """
+        Instantiate a Polygon obstacle.
+        Polygons with at least 3 vertices are solid, so particles are never generated inside them.
+
+        Args:
+            points (list(tuple)): X,Y position of each vertex, in order.
+        """
+
+        self.points = list(points)
+
+
+    def __repr__(self):
+        return "Polygon(%r)" % (self.points,)
+
+
+    def primitives(self):
+        """
+        Get the primitives making up the obstacle.
+
+        Returns:
+            tuple: Segments as (x1, y1, x2, y2), and circles as (X, Y, radius).
+        """
+
+        # Edges between consecutive vertices, closing the polygon
+        n = len(self.points)
+        segments = [(*self.points[i], *self.points[(i + 1) % n]) for i in range(n)] if n > 1 else []
+        circles = [(X, Y, 0) for X, Y in self.points]
+        return segments, circles
+
+
+class Disk:
+
+    def __init__(self, X, Y, radius):
+        """
+        Instantiate a Disk obstacle.
+
+        Args:
+            X (float): X position of center.
+            Y (float): Y position of center.
+            radius (float): Radius of disk.
+        """
+
+        self.X, self.Y = X, Y
+        self.radius = radius
+
+
+    def __repr__(self):
+        return "Disk(%r, %r, %r)" % (self.X, self.Y, self.radius)
+
+
+    def primitives(self):
+        """
+        Get the primitives making up the obstacle.
+
+        Returns:
+            tuple: Segments as (x1, y1, x2, y2), and circles as (X, Y, radius).
+        """
+
+        return [], [(self.X, self.Y, self.radius)]
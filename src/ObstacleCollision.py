@@ -0,0 +1,212 @@
+"""
+Implementation of ObstacleCollision class and methods.
+File: ObstacleCollision.py
+Author: Aidan Collins
+Github: aijac0
+Email: aidancollinscs@gmail.com
+"""
+
+from math import sqrt
+
+from Event import Event
+
+
+class ObstacleCollision(Event):
+
+    __slots__ = ('target', 'time', 'Nx', 'Ny')
+
+    def __init__(self, target, time, Nx, Ny):
+        """
+        Instantiate an ObstacleCollision object.
+
+        Args:
+            target (Particle): Particle involved in event.
+            time (float): Time until event.
+            Nx (float): X component of unit normal of obstacle at point of contact.
+            Ny (float): Y component of unit normal of obstacle at point of contact.
+        """
+        self.set(target, time, Nx, Ny)
+
+
+    def set(self, target, time, Nx, Ny):
+        """
+        Set attributes of ObstacleCollision object.
+
+        Args:
+            target (Particle): Particle involved in event.
+            time (float): Time until event.
+            Nx (float): X component of unit normal of obstacle at point of contact.
+            Ny (float): Y component of unit normal of obstacle at point of contact.
+        """
+        self.target = target
+        self.time = time
+        self.Nx = Nx
+        self.Ny = Ny
+
+
+    def simulate(self):
+        """
+        Simulate obstacle collision.
+        """
+
+        # Velocity of particle in normal direction
+        Vn = self.target.Vx * self.Nx + self.target.Vy * self.Ny
+
+        # Reflect velocity about obstacle if particle is moving into it
+        if Vn < 0:
+            self.target.Vx -= 2 * Vn * self.Nx
+            self.target.Vy -= 2 * Vn * self.Ny
+
+
+    @classmethod
+    def is_possible(cls, p, t, index):
+        """
+        Determine if obstacle collision is possible.
+
+        Args:
+            p (Particle): Particle to find event for.
+            t (float): Time to calculate possible event.
+            index (ObstacleIndex): Index of obstacles in space.
+
+        Returns:
+            tuple: Whether or not event is possible, and additional args needed for get_event().
+        """
+
+        # Obstacles near the path of particle over time
+        candidates = index.query(*p.get_bounds(t))
+
+        return bool(candidates), (candidates,)
+
+
+    @classmethod
+    def get_event(cls, p, index, candidates):
+        """
+        Get event representing the soonest instance of particle colliding with an obstacle.
+
+        Args:
+            p (Particle): Particle to find event for.
+            index (ObstacleIndex): Index of obstacles in space.
+            candidates (list): Indices of obstacle primitives near the path of particle.
+
+        Returns:
+            Event: Event representing soonest collision with obstacle, or None.
+        """
+
+        # Create event object if collision occured
+        sol = cls.solve(p, index, candidates)
+        if sol:
+            return cls(p, *sol)
+
+
+    @classmethod
+    def solve(cls, p, index, candidates):
+        """
+        Get the soonest instance of particle colliding with an obstacle, without creating an event.
+
+        Args:
+            p (Particle): Particle to find event for.
+            index (ObstacleIndex): Index of obstacles in space.
+            candidates (list): Indices of obstacle primitives near the path of particle.
+
+        Returns:
+            tuple: Time of collision and unit normal of obstacle at point of contact, or None.
+        """
+
+        # Soonest collision
+        event = None
+
+        # Get time that particle collides with each primitive
+        for i in candidates:
+            if index.is_segment(i):
+                sol = cls.__segment_collision(p, *index.primitive(i))
+            else:
+                sol = cls.__circle_collision(p, *index.primitive(i))
+
+            # Store collision if it occurs sooner
+            if sol and (event is None or sol[0] < event[0]):
+                event = sol
+
+        # Return soonest collision if collision occured
+        if event:
+            return cls.round_down(event[0], 5), event[1], event[2]
+
+
+    @classmethod
+    def __segment_collision(cls, p, x1, y1, x2, y2):
+        """
+        Get the soonest collision between particle and the interior of a segment.
+        Collisions with segment endpoints are found using circle collisions.
+
+        Args:
+            p (Particle): Particle to find collision for.
+
+        Returns:
+            tuple: Time of collision and unit normal of segment facing particle, or None.
+        """
+
+        # Unit direction and normal of segment
+        length = sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+        if length == 0:
+            return None
+        Ux, Uy = (x2 - x1) / length, (y2 - y1) / length
+        Nx, Ny = -Uy, Ux
+
+        # Distance and velocity of particle in normal direction
+        s = (p.X - x1) * Nx + (p.Y - y1) * Ny
+        Vn = p.Vx * Nx + p.Vy * Ny
+
+        # Orient normal towards particle
+        if s < 0:
+            s, Vn, Nx, Ny = -s, -Vn, -Nx, -Ny
+
+        # Particle must be moving towards segment
+        if Vn >= 0:
+            return None
+
+        # Time that particle touches line of segment
+        t = max((p.radius - s) / Vn, 0)
+
+        # Particle must touch segment between its endpoints
+        u = (p.X + p.Vx * t - x1) * Ux + (p.Y + p.Vy * t - y1) * Uy
+        if u < 0 or u > length:
+            return None
+
+        return t, Nx, Ny
+
+
+    @classmethod
+    def __circle_collision(cls, p, X, Y, radius):
+        """
+        Get the soonest collision between particle and a circle.
+
+        Args:
+            p (Particle): Particle to find collision for.
+
+        Returns:
+            tuple: Time of collision and unit normal of circle at point of contact, or None.
+        """
+
+        # Minimum distance between particle and circle before collision
+        d = p.radius + radius
+
+        # Coefficients of equation to get time that particle collides with circle
+        Dx, Dy = p.X - X, p.Y - Y
+        a = p.Vx ** 2 + p.Vy ** 2
+        b = 2 * (Dx * p.Vx + Dy * p.Vy)
+        c = Dx ** 2 + Dy ** 2 - d ** 2
+
+        # Particle must be moving towards circle
+        exp = b ** 2 - (4 * a * c)
+        if a == 0 or b >= 0 or exp < 0:
+            return None
+
+        # Soonest result of quadratic equation
+        t = max((-b - sqrt(exp)) / (2 * a), 0)
+
+        # Unit normal at point of contact
+        Nx, Ny = Dx + p.Vx * t, Dy + p.Vy * t
+        n = sqrt(Nx ** 2 + Ny ** 2)
+        if n == 0:
+            return None
+
+        return t, Nx / n, Ny / n
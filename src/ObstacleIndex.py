@@ -0,0 +1,201 @@
+"""
+Implementation of ObstacleIndex class and methods.
+File: ObstacleIndex.py
+Author: Aidan Collins
+Github: aijac0
+Email: aidancollinscs@gmail.com
+"""
+
+from math import floor, sqrt
+
+from Obstacle import Polygon
+
+
+class ObstacleIndex:
+
+    def __init__(self, obstacles, cell_size=None):
+        """
+        Instantiate an ObstacleIndex object.
+        Obstacles are split into segments and circles, which are bucketed into a uniform grid by bounding box.
+
+        Args:
+            obstacles (list): Segment, Polygon and Disk obstacles to index.
+            cell_size (float, optional): Size of each grid cell. Defaults to roughly one primitive per cell.
+        """
+
+        # Primitives making up obstacles
+        self.segments = []
+        self.circles = []
+        for obstacle in obstacles:
+            segments, circles = obstacle.primitives()
+            self.segments.extend(segments)
+            self.circles.extend(circles)
+
+        # Vertices and bounding box of each solid polygon
+        self.rings = [obstacle.points for obstacle in obstacles if isinstance(obstacle, Polygon) and len(obstacle.points) > 2]
+        self.ring_bounds = [(min(x for x, _ in ring), min(y for _, y in ring), max(x for x, _ in ring), max(y for _, y in ring))
+                            for ring in self.rings]
+
+        # Bounding box of each primitive; segments come before circles
+        self.bounds = [(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)) for x1, y1, x2, y2 in self.segments]
+        self.bounds += [(X - r, Y - r, X + r, Y + r) for X, Y, r in self.circles]
+
+        # Create grid
+        self.buckets = {}
+        if not self.bounds:
+            return
+        self.min_x = min(b[0] for b in self.bounds)
+        self.min_y = min(b[1] for b in self.bounds)
+        self.max_x = max(b[2] for b in self.bounds)
+        self.max_y = max(b[3] for b in self.bounds)
+        w, h = self.max_x - self.min_x, self.max_y - self.min_y
+        n = len(self.bounds)
+        self.cell_size = cell_size or max(sqrt(w * h / n), max(w, h) / n, 1e-9)
+        self.nx = floor(w / self.cell_size) + 1
+        self.ny = floor(h / self.cell_size) + 1
+
+        # Place each primitive in every cell its bounding box overlaps
+        for i, b in enumerate(self.bounds):
+            min_i, min_j, max_i, max_j = self.__cells(*b)
+            for ci in range(min_i, max_i + 1):
+                for cj in range(min_j, max_j + 1):
+                    self.buckets.setdefault((ci, cj), []).append(i)
+
+
+    def __len__(self):
+        """
+        Get the number of indexed primitives.
+
+        Returns:
+            int: Number of segments and circles.
+        """
+
+        return len(self.bounds)
+
+
+    def query(self, min_x, min_y, max_x, max_y):
+        """
+        Get primitives whose bounding box may overlap specified region.
+
+        Args:
+            min_x (float): Minimum X of region.
+            min_y (float): Minimum Y of region.
+            max_x (float): Maximum X of region.
+            max_y (float): Maximum Y of region.
+
+        Returns:
+            list: Sorted indices of candidate primitives.
+        """
+
+        # No primitives within region
+        if not self.buckets or max_x < self.min_x or max_y < self.min_y or min_x > self.max_x or min_y > self.max_y:
+            return []
+
+        # Cells overlapping region
+        min_i, min_j, max_i, max_j = self.__cells(min_x, min_y, max_x, max_y)
+
+        # Gather primitives in cells
+        candidates = set()
+        for ci in range(min_i, max_i + 1):
+            for cj in range(min_j, max_j + 1):
+                candidates.update(self.buckets.get((ci, cj), ()))
+
+        return sorted(candidates)
+
+
+    def is_segment(self, i):
+        """
+        Determine if primitive is a segment.
+
+        Args:
+            i (int): Index of primitive.
+
+        Returns:
+            bool: Whether primitive is a segment, rather than a circle.
+        """
+
+        return i < len(self.segments)
+
+
+    def primitive(self, i):
+        """
+        Get primitive by index.
+
+        Args:
+            i (int): Index of primitive.
+
+        Returns:
+            tuple: Segment as (x1, y1, x2, y2), or circle as (X, Y, radius).
+        """
+
+        return self.segments[i] if i < len(self.segments) else self.circles[i - len(self.segments)]
+
+
+    def overlaps(self, X, Y, radius):
+        """
+        Determine if a circle overlaps any obstacle, including lying inside a polygon.
+
+        Args:
+            X (float): X position of circle.
+            Y (float): Y position of circle.
+            radius (float): Radius of circle.
+
+        Returns:
+            bool: Whether or not circle overlaps an obstacle.
+        """
+
+        for i in self.query(X - radius, Y - radius, X + radius, Y + radius):
+            if self.is_segment(i):
+                x1, y1, x2, y2 = self.segments[i]
+                dx, dy = x2 - x1, y2 - y1
+                length = dx ** 2 + dy ** 2
+                s = min(max(((X - x1) * dx + (Y - y1) * dy) / length, 0), 1) if length else 0
+                if (X - x1 - s * dx) ** 2 + (Y - y1 - s * dy) ** 2 < radius ** 2:
+                    return True
+            else:
+                cx, cy, r = self.primitive(i)
+                if (X - cx) ** 2 + (Y - cy) ** 2 < (radius + r) ** 2:
+                    return True
+
+        # Circles not touching an edge may lie entirely inside a polygon
+        for ring, (min_x, min_y, max_x, max_y) in zip(self.rings, self.ring_bounds):
+            if min_x <= X <= max_x and min_y <= Y <= max_y and self.__contains(ring, X, Y):
+                return True
+
+        return False
+
+
+    @classmethod
+    def __contains(cls, ring, X, Y):
+        """
+        Determine if a point lies inside a polygon, by counting the edges crossed by a ray from the point.
+
+        Args:
+            ring (list(tuple)): X,Y position of each vertex of polygon, in order.
+            X (float): X position of point.
+            Y (float): Y position of point.
+
+        Returns:
+            bool: Whether or not point lies inside polygon.
+        """
+
+        inside = False
+        for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+            if (y1 > Y) != (y2 > Y) and X < x1 + (Y - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+        return inside
+
+
+    def __cells(self, min_x, min_y, max_x, max_y):
+        """
+        Get the range of grid cells overlapping a region, clamped to the grid.
+
+        Returns:
+            tuple: min_i, min_j, max_i, max_j
+        """
+
+        min_i = min(max(floor((min_x - self.min_x) / self.cell_size), 0), self.nx - 1)
+        min_j = min(max(floor((min_y - self.min_y) / self.cell_size), 0), self.ny - 1)
+        max_i = min(max(floor((max_x - self.min_x) / self.cell_size), 0), self.nx - 1)
+        max_j = min(max(floor((max_y - self.min_y) / self.cell_size), 0), self.ny - 1)
+        return min_i, min_j, max_i, max_j
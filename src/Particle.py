@@ -6,14 +6,20 @@ Github: aijac0
 Email: aidancollinscs@gmail.com
 """
 
-from math import cos, sin, pi, atan2, pow, sqrt
-from random import uniform, choice
+from math import cos, sin, pi, atan2, pow, sqrt, ceil
+from random import uniform, choice, choices
 from typing import Collection
 
 
 class Particle:
     
-    def __init__(self, color, mass, radius, X, Y, Vx, Vy):
+    # Attributes are stored in slots rather than a per-particle dict
+    __slots__ = ('color', 'species', 'mass', 'radius', 'X', 'Y', 'Vx', 'Vy')
+    
+    # Colors of generated particles when no species are given; each color is its own species
+    colors = ['b', 'c', 'm', 'y', 'r']
+    
+    def __init__(self, color, mass, radius, X, Y, Vx, Vy, species=0):
         """
         Instantiate a Particle object.
 
@@ -25,9 +31,11 @@ class Particle:
             Y (float): Y position of particle.
             Vx (float): X velocity of particle.
             Vy (float): Y velocity of particle.
+            species (int, optional): Index of particle species. Defaults to 0.
         """
         
         self.color = color
+        self.species = species
         self.mass = mass
         self.radius = radius
         self.X, self.Y = X, Y
@@ -132,8 +140,8 @@ class Particle:
     
     
     @classmethod
-    def particle_generator(cls, n_particles, width, height, color_r=['b','c','m','y','r'],
-                           density_r=(0.8,1.2), volume_r=(5,15), energy_r=(1500,2500), direction_r=(0,2*pi), **kwargs):
+    def particle_generator(cls, n_particles, width, height, color_r=colors,
+                           density_r=(0.8,1.2), volume_r=(5,15), energy_r=(1500,2500), direction_r=(0,2*pi), species=None, reject=None, n_cells=None, **kwargs):
         """
         Generator for Particle objects with specified parameters.
         Each parameter is either a float or a tuple.
@@ -146,24 +154,36 @@ class Particle:
             radius_r (tuple, optional): Radius of particle. Defaults to (5,10).
             vel_r (tuple, optional): Length of velocity vector. Defaults to (5, 20).
             direction_r (tuple, optional): Direction of vectors. Defaults to (0,2*pi).
+            species (list(Species), optional): Species to generate particles of. Defaults to one species per color.
+            reject (function, optional): Returns True if a particle must be regenerated. Defaults to None.
+            n_cells (int, optional): Number of grid cells; cells where every particle is rejected are skipped. Defaults to n_particles.
 
         Yields:
             Particle: Generated particle
         """
         
         # Divide space into equal grids for each particle
-        w, h = cls.__factorize(n_particles, width / height)
+        w, h = cls.__grid(n_cells or n_particles, width / height)
         x_grid, y_grid = width // w, height // h
         X_r, Y_r = [0, x_grid], [0, y_grid]
+        attempts = 0
         
         # Repeat particle generation indefinitely
         while True:
             
-            # Get random values from parameters
-            color = choice(color_r)
-            volume = uniform(*volume_r)
-            density = uniform(*density_r)
-            energy = uniform(*energy_r)
+            # Get random values from parameters of species
+            if species:
+                s = choices(range(len(species)), weights=[sp.weight for sp in species])[0]
+                color = species[s].color
+                volume = uniform(*species[s].volume_r)
+                density = uniform(*species[s].density_r)
+                energy = uniform(*species[s].energy_r)
+            else:
+                color = choice(color_r)
+                s = color_r.index(color)
+                volume = uniform(*volume_r)
+                density = uniform(*density_r)
+                energy = uniform(*energy_r)
             direction = uniform(*direction_r)
             
             # Translate random values into particle arguments
@@ -175,6 +195,9 @@ class Particle:
             curr_X_r = X_r[0] + radius, X_r[1] - radius
             curr_Y_r = Y_r[0] + radius, Y_r[1] - radius
             if curr_X_r[0] > curr_X_r[1] or curr_Y_r[0] > curr_Y_r[1]:
+                attempts += 1
+                if attempts > 1000:
+                    raise ValueError("Particles are too large for grid " + str((X_r, Y_r)))
                 continue
             X = uniform(*curr_X_r)
             Y = uniform(*curr_Y_r)
@@ -182,20 +205,56 @@ class Particle:
             # Get vector components from length and direction
             Vx, Vy = cls.vector_components(vel, direction)
             
+            # Create particle; continue if particle is rejected, or skip grid once attempts are exhausted
+            p = cls(color, mass, radius, X, Y, Vx, Vy, s)
+            if reject and reject(p):
+                attempts += 1
+                if attempts <= 1000:
+                    continue
+            
             # Yield particle
-            p = cls(color, mass, radius, X, Y, Vx, Vy)
-            yield p
+            else:
+                yield p
+            attempts = 0
             
-            # Get next parameters
-            if X_r[1] == width:
+            # Get next parameters, starting a new row once no cell fits in the current row
+            if X_r[1] + x_grid > width:
                 X_r[0], X_r[1] = 0, x_grid
                 Y_r[0] = Y_r[1]
                 Y_r[1] += y_grid
             else:
                 X_r[0] = X_r[1]
                 X_r[1] += x_grid
+            
+            # Every grid has been used
+            if Y_r[1] > height:
+                raise ValueError("Unable to place particles in %sx%s grid" % (w, h))
                 
                 
+    @classmethod
+    def __grid(cls, n, ratio):
+        """
+        Get the number of columns and rows of a grid with at least 'n' cells, where columns/rows is close to 'ratio'.
+
+        Args:
+            n (int): Number of cells needed.
+            ratio (float): Ratio of columns to rows to get closest to.
+
+        Returns:
+            tuple: Number of columns and rows.
+        """
+        
+        # Grid with exactly n cells
+        w, h = cls.__factorize(n, ratio)
+        
+        # Factors of n are far from ratio when n is prime, making cells too narrow; use a grid with spare cells instead
+        if max(w / h / ratio, ratio * h / w) > 2:
+            w = max(round(sqrt(n * ratio)), 1)
+            h = ceil(n / w)
+        
+        return w, h
+    
+    
     @classmethod
     def __factorize(cls, n, ratio):
         """
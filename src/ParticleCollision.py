@@ -16,6 +16,8 @@ from Particle import Particle
 
 class ParticleCollision(Event):
 
+    __slots__ = ('p1', 'p2', 'time')
+
     def __init__(self, targets, time):
         """
         Instantiate a ParticleCollision object.
@@ -24,17 +26,38 @@ class ParticleCollision(Event):
             targets (list(particles)): Particles involved in event.
             
         """
-        self.targets = targets
+        self.set(targets[0], targets[1], time)
+        
+        
+    def set(self, p1, p2, time):
+        """
+        Set attributes of ParticleCollision object.
+
+        Args:
+            p1 (Particle): First particle.
+            p2 (Particle): Second particle.
+            time (float): Time until event.
+        """
+        self.p1 = p1
+        self.p2 = p2
         self.time = time
         
         
+    @property
+    def targets(self):
+        """
+        Particles involved in event.
+        """
+        return self.p1, self.p2
+        
+        
     def simulate(self):
         """
         Simulate particle collision.
         """
          
         # Particles involved in collision.
-        p1, p2 = self.targets[0], self.targets[1]
+        p1, p2 = self.p1, self.p2
         
         # Length and direction of particle velocities before collision
         V1i, d1i = Particle.vector_direction(p1.Vx, p1.Vy)
@@ -120,6 +143,25 @@ class ParticleCollision(Event):
             Event: Event representing soonest collision between particles, or None.
         """
         
+        # Create event if collision occured
+        sol = cls.solve(p1, p2)
+        if sol:
+            return cls([p1, p2], *sol)
+        
+        
+    @classmethod
+    def solve(cls, p1, p2, *args):
+        """
+        Get the soonest instance of collision between two particles, without creating an event. 
+
+        Args:
+            p1 (Particle): First particle.
+            p2 (Particle): Second particle.
+
+        Returns:
+            tuple: Time of collision, or None.
+        """
+        
         # Minimum distance between particles before collision
         d = p1.radius + p2.radius 
         
@@ -128,24 +170,20 @@ class ParticleCollision(Event):
         b = 2 * ((p1.X - p2.X) * (p1.Vx - p2.Vx) + (p1.Y - p2.Y) * (p1.Vy - p2.Vy))
         c = p1.X ** 2 + p2.X ** 2 + p1.Y ** 2 + p2.Y ** 2 - 2 * (p1.X * p2.X + p1.Y * p2.Y) - d ** 2
         
-        # Times that particles collide
-        sols = []
-        
         # Result of expression under sqrt in quadratic equation
         exp = b ** 2 - (4 * a * c)
         
         # If the result of expression is non-negative
         if exp >= 0:
             
-            # Results of quadratic equation
+            # Soonest non-negative result of quadratic equation
             t = (-b - sqrt(exp)) / (2 * a)
-            sols.append(t) if t >= 0 else None
-            t = (-b + sqrt(exp)) / (2 * a)
-            sols.append(t) if t >= 0 else None
+            if t < 0:
+                t = (-b + sqrt(exp)) / (2 * a)
             
-            # Create event if collision occured
-            if sols:
-                return cls([p1, p2], cls.round_down(min(sols), 5))
+            # Return time if collision occured
+            if t >= 0:
+                return (cls.round_down(t, 5),)
                  
         
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+"""
+Implementation of ResultCache class and methods.
+File: ResultCache.py
+Author: Aidan Collins
+Github: aijac0
+Email: aidancollinscs@gmail.com
+"""
+
+import numpy as np
+import json
+import pickle
+from hashlib import sha256
+from os import listdir, makedirs, path, replace, utime, walk
+from shutil import copyfile, rmtree
+from tempfile import mkdtemp
+
+
+class ResultCache:
+
+    def __init__(self, directory='.sim_cache', max_size=2 ** 30):
+        """
+        Instantiate a ResultCache object.
+        Results are stored on disk, one directory per configuration, and evicted least recently used first.
+
+        Args:
+            directory (str, optional): Directory to store cached results. Defaults to '.sim_cache'.
+            max_size (int, optional): Maximum size of cache, in bytes. Defaults to 1 GiB.
+        """
+
+        # Attributes
+        self.directory = directory
+        self.max_size = max_size
+        self.version = self.code_version()
+
+        # Create cache directory
+        makedirs(self.directory, exist_ok=True)
+
+
+    def key(self, params, seed, **kwargs):
+        """
+        Get the key identifying a simulation configuration.
+        Simulated time is excluded so that runs of differing length share a key.
+
+        Args:
+            params (dict): Parameters passed to the Simulation constructor, excluding time.
+            seed (int): Seed of the random number generator.
+
+        Returns:
+            str: Hash of parameters, seed, rendering arguments and code version.
+        """
+
+        # Serialize configuration deterministically
+        config = json.dumps({'params': params, 'seed': seed, 'render': kwargs, 'version': self.version},
+                            sort_keys=True, default=repr)
+
+        return sha256(config.encode()).hexdigest()
+
+
+    def load(self, key):
+        """
+        Load cached result of configuration.
+
+        Args:
+            key (str): Key identifying configuration.
+
+        Returns:
+            dict: Frames, event log, state at the end of each frame and video path of cached run, or None.
+        """
+
+        # Directory of cached result
+        entry = path.join(self.directory, key)
+        if not path.isdir(entry):
+            return None
+
+        # Read cached result
+        try:
+            frames = np.load(path.join(entry, 'frames.npy'))
+            states = np.load(path.join(entry, 'states.npy'))
+            with open(path.join(entry, 'result.pkl'), 'rb') as f:
+                log, times = pickle.load(f)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+            return None
+
+        # Mark result as recently used
+        utime(entry)
+
+        return {'frames': frames, 'log': log, 'times': times, 'states': states, 'video': path.join(entry, 'video.avi')}
+
+
+    def store(self, key, frames, log, times, states, video):
+        """
+        Store result of configuration, replacing any shorter cached run.
+
+        Args:
+            key (str): Key identifying configuration.
+            frames (ndarray): Particle positions for each frame.
+            log (list): Events simulated during run.
+            times (ndarray): Time elapsed in space at the end of each frame.
+            states (ndarray): X,Y position and Vx,Vy velocity of each particle at the end of each frame.
+            video (str): Path to rendered video.
+        """
+
+        # Keep cached result if it covers more frames
+        entry = path.join(self.directory, key)
+        cached = self.load(key)
+        if cached is not None and len(cached['frames']) >= len(frames):
+            return
+
+        # Write result to temporary directory
+        tmp = mkdtemp(dir=self.directory, prefix='.tmp-')
+        np.save(path.join(tmp, 'frames.npy'), frames)
+        np.save(path.join(tmp, 'states.npy'), states)
+        with open(path.join(tmp, 'result.pkl'), 'wb') as f:
+            pickle.dump((log, times), f, protocol=pickle.HIGHEST_PROTOCOL)
+        copyfile(video, path.join(tmp, 'video.avi'))
+
+        # Replace previous result
+        if path.isdir(entry):
+            rmtree(entry)
+        replace(tmp, entry)
+
+        # Evict results until cache fits within maximum size
+        self.evict(keep=key)
+
+
+    def evict(self, keep=None):
+        """
+        Remove least recently used results until cache fits within maximum size.
+
+        Args:
+            keep (str, optional): Key of result to never evict. Defaults to None.
+        """
+
+        # Size and last access time of each cached result
+        entries = []
+        total = 0
+        for name in listdir(self.directory):
+            entry = path.join(self.directory, name)
+            if name.startswith('.') or not path.isdir(entry):
+                continue
+            size = self.__size(entry)
+            entries.append((path.getmtime(entry), name, size))
+            total += size
+
+        # Remove least recently used results first
+        for _, name, size in sorted(entries):
+            if total <= self.max_size:
+                break
+            if name == keep:
+                continue
+            rmtree(path.join(self.directory, name))
+            total -= size
+
+
+    @classmethod
+    def code_version(cls):
+        """
+        Get the version of the simulation code.
+
+        Returns:
+            str: Hash of every source file in the directory of the simulation code.
+        """
+
+        # Hash contents of every source file, so no module affecting results can be missed
+        h = sha256()
+        directory = path.dirname(path.abspath(__file__))
+        for name in sorted(listdir(directory)):
+            if not name.endswith('.py'):
+                continue
+            with open(path.join(directory, name), 'rb') as f:
+                h.update(name.encode())
+                h.update(f.read())
+
+        return h.hexdigest()
+
+
+    @classmethod
+    def __size(cls, directory):
+        """
+        Get the total size of files within directory.
+
+        Args:
+            directory (str): Directory to get size of.
+
+        Returns:
+            int: Size of directory, in bytes.
+        """
+
+        return sum(path.getsize(path.join(root, name)) for root, _, names in walk(directory) for name in names)
@@ -7,20 +7,20 @@ Email: aidancollinscs@gmail.com
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.collections import EllipseCollection
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
-from random import uniform
+from random import uniform, seed as random_seed
 from typing import Collection
+from shutil import copyfile
 import cv2
 from os import system
 
 from Space import Space
+from MatplotlibRenderer import MatplotlibRenderer
+from AnalyticSpace import AnalyticSpace
 
 
 class Simulation:
     
-    def __init__(self, time=300, fps=60, n_particles=30, **kwargs):
+    def __init__(self, time=300, fps=60, n_particles=30, seed=None, **kwargs):
         """
         Initialize a Simulation object.
         Each parameter is either an int or a tuple.
@@ -30,8 +30,17 @@ class Simulation:
             time (int/tuple, optional): Time to simulate, in seconds. Defaults to 300.
             fps (int/tuple, optional): Number of frames to render per second. Defaults to 60.
             n_particles (int/tuple, optional): Number of particles to simulate. Defaults to 30.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
         """
         
+        # Seed random number generator if specified
+        if seed is not None:
+            random_seed(seed)
+        
+        # Parameters identifying results; time only affects results if it is random
+        self.seed = seed
+        self.params = dict(kwargs, n_particles=n_particles, fps=fps, time=time if isinstance(time, Collection) else None)
+        
         # Get random values if specified
         n_particles = uniform(*n_particles) if isinstance(n_particles, Collection) else n_particles
         time = uniform(*time) if isinstance(time, Collection) else time
@@ -44,111 +53,183 @@ class Simulation:
         # Array to hold particle positions for each frame
         self.frames = np.empty((self.fps * self.time, n_particles, 2), dtype=np.float32)
         
+        # Arrays to hold time elapsed, and particle positions and velocities, at the end of each frame
+        self.times = np.empty(len(self.frames))
+        self.states = np.empty((len(self.frames), n_particles, 4))
+        
         # Space to simulate
         self.space = Space(n_particles, **kwargs)
         
         
-    def simulate(self, filename, **kwargs):
+    def simulate(self, filename, cache=None, fast_forward=True, analytic=False, workers=None, callback=None, **kwargs):
         """
         Simulate particles in space, rendering frames and storing them with specified filename.
 
         Args:
             filename (str): File to store rendered frames.
+            cache (ResultCache, optional): Cache to reuse results of seeded runs from. Defaults to None.
+            fast_forward (bool, optional): Simulate frames before the next event at once. Defaults to True.
+            analytic (bool, optional): Compute every frame in closed form if particles only collide with boundaries.
+                Events are not recorded in the event log. Defaults to False.
+            workers (int, optional): Number of threads to compute frames in closed form with. Defaults to None.
+            callback (function, optional): Called with the index and positions of each batch of frames. Defaults to None.
         """
         
         print("Simulating...")
         
-        # Time to simulate for each frame
+        # Time to simulate for each frame, and maximum number of frames handled at once
         tts = 1 / self.fps
+        chunk = max(int(self.fps), 1)
+        
+        # Record initial particle positions
+        positions = [(p.X, p.Y) for p in self.space.particles]
+        self.frames[0] = positions
+        self.__record_states(0, [positions], tts)
+        start = 1
+        
+        # Results can only be reused if the run is reproducible
+        key = cache.key(self.params, self.seed, fast_forward=fast_forward, analytic=analytic, **kwargs) if cache is not None and self.seed is not None else None
+        cached = cache.load(key) if key is not None else None
+        
+        # Return cached result if it covers every frame
+        if cached is not None and len(cached['frames']) == len(self.frames):
+            print("Loaded from cache")
+            self.__restore(cached, len(self.frames))
+            copyfile(cached['video'], filename + '.avi')
+            if callback:
+                for i in range(1, len(self.frames), chunk):
+                    callback(i, self.frames[i:i + chunk])
+            return
+        
+        # Initialize renderer
+        renderer = MatplotlibRenderer(filename, self.space, self.fps, **kwargs)
+        
+        # Reuse cached frames, extending a shorter run from its final state
+        if cached is not None:
+            start = min(len(cached['frames']), len(self.frames))
+            self.__restore(cached, start)
+            video = cv2.VideoCapture(cached['video'])
+            for i in range(1, start, chunk):
+                self.__copy_video(video, renderer.out, min(chunk, start - i))
+                if callback:
+                    callback(i, self.frames[i:min(i + chunk, start)])
+            video.release()
+            print("Resuming from cache at frame " + str(start))
+        
+        # Number of frames to look ahead for events
+        horizon = 1
+        
+        # Compute frames in closed form if specified and particles only collide with boundaries
+        i = start
+        if analytic and AnalyticSpace.is_supported(self.space) and i < len(self.frames):
+            space = AnalyticSpace(self.space)
+            
+            # Compute each chunk of frames from the state of space at the first frame
+            n_frames = len(self.frames) - i
+            for j in range(0, n_frames, chunk):
+                times = tts * np.arange(j + 1, min(j + chunk, n_frames) + 1)
+                states = space.states(times, workers)
+                self.frames[i + j:i + j + len(times)] = states[..., :2]
+                self.times[i + j:i + j + len(times)] = self.space.time + times
+                self.states[i + j:i + j + len(times)] = states
+                
+                # Render and store frames
+                renderer.render_batch(self.frames[i + j:i + j + len(times)])
+                if callback:
+                    callback(i + j, self.frames[i + j:i + j + len(times)])
+                print("Frame: " + str(i + j + len(times) - 1))
+            
+            # Proceed simulation until end of last frame
+            space.simulate(tts * n_frames)
+            i = len(self.frames)
         
-        # Initialize visualization environment
-        fig, ax, s, c, out = self.__init_visualize(filename, **kwargs)
-        
-        # Simulate each frame
-        for i in range(1, len(self.frames)):
-            print("Frame: " + str(i))
+        # Simulate each frame, or each batch of frames before the next event
+        while i < len(self.frames):
+            
+            # Elapse time in space
+            if fast_forward:
+                batch = self.space.fast_forward(tts, min(horizon, len(self.frames) - i))
+            else:
+                self.space.simulate(tts)
+                batch = [[(p.X, p.Y) for p in self.space.particles]]
+            self.frames[i:i + len(batch)] = batch
+            self.__record_states(i, batch, tts)
             
-            # Elapse time in space 
-            self.space.simulate(tts)
+            # Render and store frames
+            renderer.render_batch(self.frames[i:i + len(batch)])
+            if callback:
+                callback(i, self.frames[i:i + len(batch)])
+            i += len(batch)
+            print("Frame: " + str(i - 1))
             
-            # Render and store frame
-            self.__visualize_frame(fig, ax, s, c, out)
+            # Look further ahead while frames are free of events, at most one second at a time
+            horizon = min(horizon * 2, chunk) if len(batch) == horizon else 1
             
-        # Finalize visualization environment
-        self.__final_visualize(out)
+        # Finalize renderer
+        renderer.release()
+        
+        # Store result in cache
+        if key is not None and start < len(self.frames):
+            cache.store(key, self.frames, self.space.log, self.times, self.states, filename + '.avi')
         
     
-    def __init_visualize(self, filename, ratio=(800,800)):
+    def __record_states(self, i, batch, tts):
         """
-        Initialize frame visualization environment.
+        Record the state of space at the end of each frame of a batch simulated before the next event.
 
         Args:
-            filename (str): File to store rendered frames.
-            ratio (tuple, optional): Aspect ratio of each frame. Defaults to (800,800).
-
-        Returns:
-            tuple: figure, axis, sizes, colors, output stream
+            i (int): Index of first frame of batch.
+            batch (ndarray): X,Y position of each particle at the end of each frame of batch.
+            tts (float): Time simulated for each frame.
         """
         
-        # Create plot
-        plt.rcParams["figure.figsize"] = [ratio[0] / 100, ratio[1] / 100]
-        plt.rcParams["figure.autolayout"] = True
-        fig, ax = plt.subplots()
-        ax.set_xlim((0, self.space.width))
-        ax.set_ylim((0, self.space.height))
-        ax.get_xaxis().set_visible(False)
-        ax.get_yaxis().set_visible(False)
-        ax.set_aspect('equal')
+        # Velocities are unchanged within batch
+        self.states[i:i + len(batch), :, :2] = batch
+        self.states[i:i + len(batch), :, 2:] = [(p.Vx, p.Vy) for p in self.space.particles]
         
-        # Get particle sizes
-        s = [p.radius * 2 for p in self.space.particles]
+        # Time is elapsed frame by frame, as it is in space
+        time = self.times[i - 1] if i > 0 else 0
+        for j in range(i, i + len(batch) - 1):
+            time += tts
+            self.times[j] = time
+        self.times[i + len(batch) - 1] = self.space.time
         
-        # Get particle colors
-        c = [p.color for p in self.space.particles]
-        
-        # Create stream to video file
-        out = cv2.VideoWriter(filename + '.avi', cv2.VideoWriter_fourcc(*'DIVX'), self.fps, ratio)
-        
-        return fig, ax, s, c, out
-        
-        
-    def __visualize_frame(self, fig, ax, s, c, out):
+    
+    def __restore(self, cached, n_frames):
         """
-        Visualize frame and store to output stream
+        Restore frames, event log and state of space from the first frames of a cached run.
 
         Args:
-            fig (Figure): Matplotlib figure for frame
-            ax (Axes): Matplotlib axis for frame
-            s (list): Size of each particle
-            c (list): Color of each particle
-            out (VideoWriter): Output stream to write rendered frames to.
+            cached (dict): Cached result returned by ResultCache.load().
+            n_frames (int): Number of frames to restore.
         """
-
-        # Plot particles
-        offsets = [(p.X, p.Y) for p in self.space.particles]
-        pts = ax.add_collection(EllipseCollection(widths=s, heights=s, facecolor=c, angles=0, units='xy', offsets=offsets, transOffset=ax.transData))
         
-        # Get plot as image
-        canvas = FigureCanvas(fig)
-        canvas.draw()
-        image = np.frombuffer(canvas.tostring_rgb(), dtype='uint8')
-        image = image.reshape(canvas.get_width_height()[::-1] + (3,))
-        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-        out.write(image)
+        # Restore frames and the state of space at the end of the last frame
+        self.frames[:n_frames] = cached['frames'][:n_frames]
+        self.times[:n_frames] = cached['times'][:n_frames]
+        self.states[:n_frames] = cached['states'][:n_frames]
+        self.space.set_state((float(self.times[n_frames - 1]), self.states[n_frames - 1].tolist()))
         
-        # Reset plot
-        pts.remove()
+        # Restore events simulated until the end of the last frame
+        end = self.times[n_frames - 1]
+        self.space.log = [event for event in cached['log'] if event[0] <= end]
         
-        
-    def __final_visualize(self, out):
+    
+    def __copy_video(self, video, out, n_frames):
         """
-        Finalize frame visualization environment.
+        Copy rendered frames from video to output stream.
 
         Args:
+            video (VideoCapture): Video to copy frames from.
             out (VideoWriter): Output stream to write rendered frames to.
+            n_frames (int): Number of frames to copy.
         """
         
-        out.release()
+        for _ in range(n_frames):
+            success, image = video.read()
+            if not success:
+                break
+            out.write(image)
 
     
 if __name__ == "__main__":
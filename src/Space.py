@@ -6,17 +6,23 @@ Github: aijac0
 Email: aidancollinscs@gmail.com
 """
 
+import numpy as np
 from random import uniform
 from typing import Collection
-from math import sqrt
+from math import sqrt, ceil
 
 from Particle import Particle
 from EventManager import EventManager
+from CollisionResolver import CollisionResolver
+from ObstacleIndex import ObstacleIndex
 
 
 class Space:
     
-    def __init__(self, n_particles, width=500, height=500, **kwargs):
+    # Event times are rounded down by up to 1e-3, so events may be found this much sooner from the start of a later frame
+    margin = 2e-3
+    
+    def __init__(self, n_particles, width=500, height=500, obstacles=None, batch_collisions=False, **kwargs):
         """
         Create a 2D particle space.
         Each optional parameter is either an int or a tuple.
@@ -26,6 +32,8 @@ class Space:
             n_particles (int): Number of particles in space.
             height (int/tuple, optional): Size of Y dimension. Defaults to 500.
             width (int/tuple, optional): Size of X dimension. Defaults to 500.
+            obstacles (list, optional): Static Segment, Polygon and Disk obstacles. Defaults to None.
+            batch_collisions (bool, optional): Simulate simultaneous collisions in batches. Defaults to False.
         """
         
         # Get random values if specified
@@ -36,7 +44,11 @@ class Space:
         self.n_particles = n_particles
         self.width = width
         self.height = height
-        self.manager = EventManager(self, **kwargs)
+        self.batch_collisions = batch_collisions
+        self.time = 0
+        self.log = []
+        self.obstacles = ObstacleIndex(obstacles or [])
+        self.manager = EventManager(index=self.obstacles, **kwargs)
         
         # Create particles
         self.__create_particles(**kwargs)
@@ -56,14 +68,137 @@ class Space:
             # Get the next events to occur
             self.manager.get_events(self.particles, tts, self.width, self.height)
             
-            # Proceed simulation until event
-            for p in self.particles:
-                p.simulate(self.manager.time)
-            tts -= self.manager.time
-                
-            # Simulate events
+            # Proceed simulation until event, and simulate event
+            tts -= self.__simulate_events()
+            
+            
+    def fast_forward(self, tts, n_frames):
+        """
+        Simulate particles in space for every frame that ends before the next event.
+        If the next event may occur within the first frame, only the first frame is simulated.
+        Results are identical to calling simulate(tts) once for each frame.
+
+        Args:
+            tts (float): Time to simulate for each frame.
+            n_frames (int): Maximum number of frames to simulate.
+
+        Returns:
+            ndarray: X,Y position of each particle at the end of each simulated frame.
+        """
+        
+        # Get the next events to occur within every frame
+        self.manager.get_events(self.particles, tts * n_frames, self.width, self.height)
+        
+        # Number of frames ending before the next event
+        # Event times found from the start of a later frame are rounded differently, so frames close to event are excluded
+        if self.manager.events:
+            k = min(max(ceil((self.manager.time - Space.margin) / tts) - 1, 0), n_frames)
+        else:
+            k = n_frames
+        
+        # Simulate first frame as simulate(tts) would, reusing events if they were found for the same time
+        if k == 0:
+            if n_frames == 1:
+                self.simulate(tts - self.__simulate_events())
+            else:
+                self.simulate(tts)
+            return np.array([[(p.X, p.Y) for p in self.particles]])
+        
+        # Positions of particles at the end of each frame
+        # Displacements are summed frame by frame to match the rounding of simulate()
+        frames = np.empty((k + 1, len(self.particles), 2))
+        frames[0] = [(p.X, p.Y) for p in self.particles]
+        frames[1:] = np.multiply.outer(np.ones(k), [(p.Vx * tts, p.Vy * tts) for p in self.particles])
+        frames = np.cumsum(frames, axis=0)[1:]
+        
+        # Proceed simulation until end of last frame
+        for p, (X, Y) in zip(self.particles, frames[-1].tolist()):
+            p.X, p.Y = X, Y
+        for _ in range(k):
+            self.time += tts
+        
+        return frames
+    
+    
+    def __simulate_events(self):
+        """
+        Proceed simulation until the events found by the manager, then simulate and log them.
+
+        Returns:
+            float: Time simulated.
+        """
+        
+        # Proceed simulation until event
+        for p in self.particles:
+            p.simulate(self.manager.time)
+        self.time += self.manager.time
+            
+        # Simulate events
+        if self.batch_collisions:
+            CollisionResolver.resolve(self.manager.events)
+        else:
             for event in self.manager.events:
                 event.simulate()
+                
+        # Log events
+        for event in self.manager.events:
+            self.__log_event(event)
+            
+        return self.manager.time
+                
+                
+    def get_state(self):
+        """
+        Get the state of space needed to resume simulation.
+
+        Returns:
+            tuple: Time elapsed, and X,Y position and Vx,Vy velocity of each particle.
+        """
+        
+        return self.time, [(p.X, p.Y, p.Vx, p.Vy) for p in self.particles]
+    
+    
+    def set_state(self, state):
+        """
+        Restore the state of space returned by get_state().
+
+        Args:
+            state (tuple): Time elapsed, and X,Y position and Vx,Vy velocity of each particle.
+        """
+        
+        self.time, vectors = state
+        for p, (X, Y, Vx, Vy) in zip(self.particles, vectors):
+            p.X, p.Y, p.Vx, p.Vy = X, Y, Vx, Vy
+            
+            
+    def __overlaps(self, p):
+        """
+        Determine if particle overlaps an obstacle.
+
+        Args:
+            p (Particle): Particle to check.
+
+        Returns:
+            bool: Whether or not particle overlaps an obstacle.
+        """
+        
+        return self.obstacles.overlaps(p.X, p.Y, p.radius)
+    
+    
+    def __log_event(self, event):
+        """
+        Record simulated event in event log.
+
+        Args:
+            event (Event): Simulated event.
+        """
+        
+        # Particles involved in event
+        targets = event.targets if hasattr(event, 'targets') else [event.target]
+        
+        # Store time, type and particle indices of event
+        indices = tuple(self.__index[id(p)] for p in targets)
+        self.log.append((self.time, type(event).__name__, indices))
                                  
                             
     def __create_particles(self, **kwargs):
@@ -74,12 +209,26 @@ class Space:
         # Create list to hold particles
         self.particles = [None] * self.n_particles
         
-        # Create particle generator
-        p_gen = Particle.particle_generator(self.n_particles, self.width, self.height, **kwargs)
-        
-        # Iteratively generate new particles
-        for i in range(self.n_particles):
-            self.particles[i] = p_gen.__next__()
+        # Obstacles may cover grids entirely, so use finer grids until every particle is placed
+        n_cells = self.n_particles
+        while True:
+            
+            # Create particle generator
+            p_gen = Particle.particle_generator(self.n_particles, self.width, self.height, reject=self.__overlaps,
+                                                n_cells=n_cells, **kwargs)
+            
+            # Iteratively generate new particles
+            try:
+                for i in range(self.n_particles):
+                    self.particles[i] = p_gen.__next__()
+                break
+            except ValueError:
+                if not len(self.obstacles) or n_cells >= 16 * self.n_particles:
+                    raise
+                n_cells *= 2
+            
+        # Map particles to their index
+        self.__index = {id(p): i for i, p in enumerate(self.particles)}
                     
                     
 if __name__ == "__main__":
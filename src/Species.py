@@ -0,0 +1,36 @@
+"""
+Implementation of Species class and methods.
+File: Species.py
+Author: Aidan Collins
+Github: aijac0
+Email: aidancollinscs@gmail.com
+"""
+
+
+class Species:
+
+    def __init__(self, name, color='b', density_r=(0.8,1.2), volume_r=(5,15), energy_r=(1500,2500), weight=1):
+        """
+        Instantiate a Species object.
+        Each range is a tuple, meaning that a random value within bounds will be given to each particle.
+
+        Args:
+            name (str): Name of species.
+            color (str, optional): Color of particles. Defaults to 'b'.
+            density_r (tuple, optional): Density of particles. Defaults to (0.8,1.2).
+            volume_r (tuple, optional): Volume of particles. Defaults to (5,15).
+            energy_r (tuple, optional): Kinetic energy of particles. Defaults to (1500,2500).
+            weight (float, optional): Relative likelihood of generating particle of species. Defaults to 1.
+        """
+
+        self.name = name
+        self.color = color
+        self.density_r = density_r
+        self.volume_r = volume_r
+        self.energy_r = energy_r
+        self.weight = weight
+
+
+    def __repr__(self):
+        return "Species(%r, %r, %r, %r, %r, %r)" % (self.name, self.color, self.density_r, self.volume_r,
+                                                    self.energy_r, self.weight)